@@ -0,0 +1,320 @@
+"""Fleet-scale benchmark of setup and polling, run fully offline.
+
+Starts tools/mock_rapt_cloud.py in a subprocess (so its CPU time is not
+counted), then for each fleet size sets up a real config entry in a test
+Home Assistant instance and polls every coordinator a few times.
+
+    pip install -r benchmarks/requirements.txt
+    python benchmarks/bench_fleet.py --output bench.json
+    python benchmarks/bench_fleet.py --baseline bench.json
+
+Reported per fleet size (devices per type):
+    setup_s               wall time of the config entry setup
+    coordinators.*        per-refresh CPU and wall time, async_write_ha_state
+                          calls per refresh, size of coordinator data
+    loop_lag_ms           event loop lag while polling (max / p99)
+    refresh_peak_bytes    peak allocation during one refresh of all coordinators
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+
+import aiohttp
+
+from homeassistant import loader
+from homeassistant.const import __version__ as HA_VERSION
+from homeassistant.helpers.entity import Entity
+from homeassistant.setup import async_setup_component
+from pytest_homeassistant_custom_component.common import MockConfigEntry, async_test_home_assistant
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from custom_components.rapt_cloud_link.api.models import field_names  # noqa: E402
+from custom_components.rapt_cloud_link.api.scheduler import RequestScheduler  # noqa: E402
+from custom_components.rapt_cloud_link.const import (  # noqa: E402
+    CONF_API_BASE_URL,
+    CONF_TOKEN_URL,
+    DOMAIN,
+    GET_FRESHNESS,
+)
+
+COORDINATORS = (
+    "brewzilla_coordinator",
+    "hydrometer_coordinator",
+    "temperature_controller_coordinator",
+)
+
+# Metrics compared against a baseline, lower is better
+COMPARED = ("setup_s", "cpu_ms_median", "state_writes", "data_bytes", "loop_lag_ms_p99", "refresh_peak_bytes")
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _deep_size(obj, seen=None):
+    """Approximate memory held by coordinator data: dicts, device models and their values."""
+    if seen is None:
+        seen = set()
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(_deep_size(k, seen) + _deep_size(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set)):
+        size += sum(_deep_size(item, seen) for item in obj)
+    elif hasattr(obj, "__slots__"):
+        size += sum(_deep_size(getattr(obj, name), seen) for name in field_names(obj))
+    return size
+
+
+class WriteCounter:
+    """Count async_write_ha_state calls across all entities."""
+
+    def __init__(self):
+        self.count = 0
+        self._original = Entity.async_write_ha_state
+
+    def __enter__(self):
+        counter = self
+
+        def async_write_ha_state(entity):
+            counter.count += 1
+            return counter._original(entity)
+
+        Entity.async_write_ha_state = async_write_ha_state
+        return self
+
+    def __exit__(self, *exc):
+        Entity.async_write_ha_state = self._original
+
+
+class LoopLagMonitor:
+    """Measure how late a short periodic sleep wakes up."""
+
+    def __init__(self, interval=0.005):
+        self.interval = interval
+        self.samples = []
+        self._task = None
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            started = loop.time()
+            await asyncio.sleep(self.interval)
+            self.samples.append(max(0.0, loop.time() - started - self.interval))
+
+    def start(self):
+        self.samples = []
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        if not self.samples:
+            return {"max": None, "p99": None}
+        samples = sorted(self.samples)
+        return {
+            "max": round(samples[-1] * 1000, 2),
+            "p99": round(samples[min(len(samples) - 1, int(len(samples) * 0.99))] * 1000, 2),
+        }
+
+
+async def _wait_for_mock(base, timeout=15):
+    deadline = time.monotonic() + timeout
+    async with aiohttp.ClientSession() as session:
+        while True:
+            try:
+                async with session.get(f"{base}/mock/stats") as resp:
+                    if resp.status == 200:
+                        return
+            except aiohttp.ClientError:
+                pass
+            if time.monotonic() > deadline:
+                raise RuntimeError("mock cloud did not start")
+            await asyncio.sleep(0.1)
+
+
+async def _configure_mock(base, **config):
+    async with aiohttp.ClientSession() as session:
+        async with session.post(f"{base}/mock/config", json=config) as resp:
+            resp.raise_for_status()
+
+
+async def bench_size(hass, base, devices, polls):
+    await _configure_mock(base, brewzillas=devices, hydrometers=devices, controllers=devices)
+    email = f"bench-{devices}@example.com"
+    # Benchmarks measure our own cost, not the per-account rate limit
+    hass.data.setdefault(f"{DOMAIN}_schedulers", {})[email] = RequestScheduler(rate=1000, burst=1000, reserve=0)
+
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title=email,
+        data={
+            "email": email,
+            "api_token": "bench",
+            CONF_API_BASE_URL: f"{base}/api",
+            CONF_TOKEN_URL: f"{base}/connect/token",
+        },
+    )
+    entry.add_to_hass(hass)
+
+    started = time.perf_counter()
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    setup_s = time.perf_counter() - started
+
+    entry_data = hass.data[DOMAIN][entry.entry_id]
+    result = {
+        "devices": devices,
+        "entities": len(hass.states.async_entity_ids()),
+        "setup_s": round(setup_s, 3),
+        "coordinators": {},
+    }
+
+    monitor = LoopLagMonitor()
+    monitor.start()
+    with WriteCounter() as writes:
+        for key in COORDINATORS:
+            coordinator = entry_data[key]
+            cpu, wall, state_writes = [], [], []
+            for _ in range(polls):
+                # Let the client's short-lived GET cache expire so every refresh reaches the mock
+                await asyncio.sleep(GET_FRESHNESS)
+                writes.count = 0
+                cpu_started, wall_started = time.process_time(), time.perf_counter()
+                await coordinator.async_refresh()
+                cpu.append(time.process_time() - cpu_started)
+                wall.append(time.perf_counter() - wall_started)
+                state_writes.append(writes.count)
+            result["coordinators"][key] = {
+                "cpu_ms_median": round(statistics.median(cpu) * 1000, 2),
+                "cpu_ms_max": round(max(cpu) * 1000, 2),
+                "wall_ms_median": round(statistics.median(wall) * 1000, 2),
+                "state_writes": statistics.median(state_writes),
+                "data_bytes": _deep_size(coordinator.data),
+            }
+    lag = await monitor.stop()
+    result["loop_lag_ms_max"] = lag["max"]
+    result["loop_lag_ms_p99"] = lag["p99"]
+
+    # Allocation pass, kept apart because tracing slows everything down
+    await asyncio.sleep(GET_FRESHNESS)
+    tracemalloc.start()
+    for key in COORDINATORS:
+        await entry_data[key].async_refresh()
+    result["refresh_peak_bytes"] = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.config_entries.async_remove(entry.entry_id)
+    await hass.async_block_till_done()
+    return result
+
+
+def _flatten(result):
+    """Yield (metric path, value) pairs of the compared metrics."""
+    for key in COMPARED:
+        if key in result:
+            yield key, result[key]
+    for name, stats in result["coordinators"].items():
+        for key in COMPARED:
+            if key in stats:
+                yield f"{name}.{key}", stats[key]
+
+
+def compare(results, baseline, tolerance):
+    """Print metrics that got worse than the baseline by more than tolerance, return their count."""
+    previous = {item["devices"]: dict(_flatten(item)) for item in baseline["results"]}
+    regressions = 0
+    for result in results:
+        before = previous.get(result["devices"])
+        if before is None:
+            continue
+        for metric, value in _flatten(result):
+            old = before.get(metric)
+            if not old or value is None:
+                continue
+            change = (value - old) / old
+            if change > tolerance:
+                regressions += 1
+                print(f"REGRESSION {result['devices']} devices {metric}: {old} -> {value} (+{change:.0%})")
+    return regressions
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000], help="devices per type")
+    parser.add_argument("--polls", type=int, default=5, help="refreshes per coordinator")
+    parser.add_argument("--output", help="write JSON results to this file instead of stdout")
+    parser.add_argument("--baseline", help="compare against an earlier --output file")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed relative regression")
+    args = parser.parse_args()
+
+    port = _free_port()
+    base = f"http://127.0.0.1:{port}"
+    mock = subprocess.Popen(
+        [sys.executable, str(ROOT / "tools" / "mock_rapt_cloud.py"), "--host", "127.0.0.1", "--port", str(port), "--seed", "1"],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    results = []
+    try:
+        await _wait_for_mock(base)
+        with tempfile.TemporaryDirectory() as config_dir:
+            os.symlink(ROOT / "custom_components", Path(config_dir) / "custom_components")
+            async with async_test_home_assistant(config_dir=config_dir) as hass:
+                # Same as the enable_custom_integrations fixture
+                hass.data.pop(loader.DATA_CUSTOM_COMPONENTS, None)
+                await async_setup_component(
+                    hass, "http", {"http": {"server_host": ["127.0.0.1"], "server_port": _free_port()}}
+                )
+                for devices in args.sizes:
+                    results.append(await bench_size(hass, base, devices, args.polls))
+                    print(f"{devices} devices per type done", file=sys.stderr)
+                await hass.async_stop(force=True)
+    finally:
+        mock.terminate()
+        mock.wait()
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "homeassistant": HA_VERSION,
+            "polls": args.polls,
+        },
+        "results": results,
+    }
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2))
+    else:
+        print(json.dumps(report, indent=2))
+
+    if args.baseline:
+        regressions = compare(results, json.loads(Path(args.baseline).read_text()), args.tolerance)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -1,56 +1,255 @@
+import asyncio
 from datetime import timedelta
 import logging
+import time
+
+import voluptuous as vol
+
+from homeassistant.core import SupportsResponse
+from homeassistant.exceptions import ConfigEntryNotReady, HomeAssistantError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers import device_registry as dr
+from homeassistant.util import dt as dt_util
 
 from .coordinator.brewzilla_coordinator import BrewZillaDataUpdateCoordinator
 from .coordinator.hydrometer_coordinator import HydrometerDataUpdateCoordinator
 from .coordinator.temperature_controller_coordinator import TemperatureControllerDataUpdateCoordinator
 
-from .const import DOMAIN
+from .const import (
+    CONF_BACKFILL_DAYS,
+    CONF_DOWNSAMPLE,
+    CONF_POLL_INTERVAL,
+    DEFAULT_BACKFILL_DAYS,
+    DEFAULT_DOWNSAMPLE,
+    DEFAULT_POLL_INTERVAL,
+    DOMAIN,
+    PROFILE_DEFAULT_DURATION,
+    PROFILE_MAX_DURATION,
+    SERVICE_GET_HISTORY,
+    SERVICE_PROFILE,
+)
+from .backfill import TelemetryBackfill
+from .history import TelemetryHistory
 from .api.token_manager import TokenManager
+from .api.client import RaptCloudClient
+from .metrics import RaptMetrics
+from .profiler import async_get_profiler
+from .statistics import DownsampledStatistics
+from .storage import RaptCacheStore
+from .webhook import async_setup_webhook
 
 _LOGGER = logging.getLogger(__name__)
-PLATFORMS = ["sensor", "switch", "number"]
+PLATFORMS = ["sensor", "binary_sensor", "switch", "number"]
+UNLOADED_STORES = f"{DOMAIN}_unloaded_stores"
+COORDINATOR_KEYS = ("brewzilla_coordinator", "hydrometer_coordinator", "temperature_controller_coordinator")
+
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+PROFILE_SCHEMA = vol.All(
+    vol.Schema(
+        {
+            vol.Optional("duration"): vol.All(vol.Coerce(int), vol.Range(min=1, max=PROFILE_MAX_DURATION)),
+            vol.Optional("polls"): vol.All(vol.Coerce(int), vol.Range(min=1)),
+        }
+    ),
+    cv.has_at_most_one_key("duration", "polls"),
+)
+
+GET_HISTORY_SCHEMA = vol.Schema(
+    {
+        vol.Required("device_id"): cv.string,
+        vol.Optional("hours"): vol.All(vol.Coerce(float), vol.Range(min=0)),
+    }
+)
+
+
+def _rapt_device_id(hass, device_id):
+    """Map a Home Assistant device id to the RAPT device id, raw RAPT ids pass through."""
+    device = dr.async_get(hass).async_get(device_id)
+    if device is None:
+        return device_id
+    for domain, identifier in device.identifiers:
+        if domain == DOMAIN:
+            return identifier
+    return device_id
+
+
+async def async_setup(hass, config):
+    """Register the domain services."""
+
+    async def async_handle_profile(call):
+        polls = call.data.get("polls")
+        duration = call.data.get("duration", None if polls else PROFILE_DEFAULT_DURATION)
+        path = await async_get_profiler(hass).async_profile(duration=duration, polls=polls)
+        return {"path": path}
+
+    async def async_handle_get_history(call):
+        device_id = _rapt_device_id(hass, call.data["device_id"])
+        hours = call.data.get("hours")
+        since = None if hours is None else dt_util.utcnow().timestamp() - hours * 3600
+        for data in hass.data.get(DOMAIN, {}).values():
+            if any(device_id in (data[key].data or {}) for key in COORDINATOR_KEYS):
+                return {"device_id": device_id, "samples": data["history"].get(device_id, since)}
+        raise HomeAssistantError(f"Unknown RAPT device: {call.data['device_id']}")
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_PROFILE,
+        async_handle_profile,
+        schema=PROFILE_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_HISTORY,
+        async_handle_get_history,
+        schema=GET_HISTORY_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+    return True
+
 
 async def async_setup_entry(hass, entry):
-    update_interval = timedelta(minutes=entry.options.get("poll_interval", 3))
+    setup_started = time.monotonic()
+    update_interval = timedelta(minutes=entry.options.get(CONF_POLL_INTERVAL, DEFAULT_POLL_INTERVAL))
     _LOGGER.info("Using polling interval: %s", update_interval)
 
     email = entry.data["email"]
     api_token = entry.data["api_token"]
 
-    token_manager = TokenManager(hass, email, api_token, entry)
+    cache = RaptCacheStore(hass, entry)
+    await cache.async_load()
+    history = TelemetryHistory(hass, entry)
+    await history.async_load()
+
+    metrics = RaptMetrics()
+    token_manager = TokenManager(hass, email, api_token, entry, cache=cache, metrics=metrics)
+    client = RaptCloudClient(hass, token_manager, entry, metrics=metrics)
+
+    recorder = "recorder" in hass.config.components
+    backfill_days = entry.options.get(CONF_BACKFILL_DAYS, DEFAULT_BACKFILL_DAYS) if recorder else 0
+
+    # Downsampled mode writes live readings as hourly statistics instead of frequent states.
+    # With the backfill running, the current partial hour is left to it.
+    downsampler = None
+    if entry.options.get(CONF_DOWNSAMPLE, DEFAULT_DOWNSAMPLE) and recorder:
+        since = None
+        if backfill_days:
+            since = dt_util.utcnow().replace(minute=0, second=0, microsecond=0) + timedelta(hours=1)
+        downsampler = DownsampledStatistics(hass, entry, cache=cache, since=since)
 
     # Coordinators
-    brewzilla_coordinator = BrewZillaDataUpdateCoordinator(hass, token_manager, update_interval, entry)
-    hydrometer_coordinator = HydrometerDataUpdateCoordinator(hass, token_manager, update_interval, entry)
-    temperature_controller_coordinator = TemperatureControllerDataUpdateCoordinator(hass, token_manager, update_interval, entry)
+    brewzilla_coordinator = BrewZillaDataUpdateCoordinator(
+        hass, client, update_interval, entry, cache=cache, history=history, downsampler=downsampler
+    )
+    hydrometer_coordinator = HydrometerDataUpdateCoordinator(
+        hass, client, update_interval, entry, cache=cache, history=history, downsampler=downsampler
+    )
+    temperature_controller_coordinator = TemperatureControllerDataUpdateCoordinator(
+        hass, client, update_interval, entry, cache=cache, history=history, downsampler=downsampler
+    )
+
+    coordinators = (brewzilla_coordinator, hydrometer_coordinator, temperature_controller_coordinator)
+
+    # Coordinators with a cached snapshot start warm (marked stale) and refresh in the background
+    warm = [coordinator for coordinator in coordinators if coordinator.restore_snapshot()]
+    cold = [coordinator for coordinator in coordinators if coordinator not in warm]
+
+    # First refresh of the remaining device types concurrently, fail only if every type fails.
+    # The token fetch is single-flight, so the refreshes share one request.
+    results = await asyncio.gather(
+        *(coordinator.async_config_entry_first_refresh() for coordinator in cold),
+        return_exceptions=True,
+    )
+    failed = 0
+    for coordinator, result in zip(cold, results):
+        if isinstance(result, asyncio.CancelledError):
+            await token_manager.async_shutdown()
+            await client.async_close()
+            raise result
+        if isinstance(result, Exception):
+            failed += 1
+            _LOGGER.warning("Initial refresh of %s failed: %s", coordinator.name, result)
+            coordinator.data = {}
 
-    await brewzilla_coordinator.async_config_entry_first_refresh()
-    await hydrometer_coordinator.async_config_entry_first_refresh()
-    await temperature_controller_coordinator.async_config_entry_first_refresh()
+    if not warm and failed == len(cold):
+        await token_manager.async_shutdown()
+        await client.async_close()
+        # Keep the fetched token for the retry, which reads the cache right away
+        await cache.async_flush()
+        raise ConfigEntryNotReady("Failed to fetch data for every RAPT device type")
 
     hass.data.setdefault(DOMAIN, {})
     hass.data[DOMAIN][entry.entry_id] = {
+        "cache": cache,
+        "history": history,
+        "metrics": metrics,
         "token_manager": token_manager,
+        "client": client,
         "brewzilla_coordinator": brewzilla_coordinator,
         "hydrometer_coordinator": hydrometer_coordinator,
         "temperature_controller_coordinator": temperature_controller_coordinator,
     }
 
+    await async_setup_webhook(hass, entry)
+
     entry.async_on_unload(entry.add_update_listener(update_listener))
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
+    for coordinator in coordinators:
+        coordinator.async_start_tracking()
+
+    for coordinator in warm:
+        entry.async_create_background_task(
+            hass, coordinator.async_refresh(), f"{DOMAIN} {coordinator.name} warm-start refresh"
+        )
+    if warm:
+        _LOGGER.debug("Started warm from cache: %s", ", ".join(c.name for c in warm))
+
+    if backfill_days:
+        backfill = TelemetryBackfill(
+            hass,
+            entry,
+            cache,
+            backfill_days,
+            [
+                (hydrometer_coordinator, client.get_hydrometer_telemetry),
+                (temperature_controller_coordinator, client.get_temperature_controller_telemetry),
+            ],
+            until=downsampler.since if downsampler is not None else None,
+        )
+        entry.async_create_background_task(hass, backfill.async_run(), f"{DOMAIN} telemetry backfill")
+
+    _LOGGER.info("RAPT Cloud Link setup finished in %.2f s", time.monotonic() - setup_started)
     return True
 
 async def async_unload_entry(hass, entry):
     """Unload the integration: remove platforms and clear data."""
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     if unload_ok:
-        hass.data[DOMAIN].pop(entry.entry_id)
+        data = hass.data[DOMAIN].pop(entry.entry_id)
+        for key in COORDINATOR_KEYS:
+            await data[key].async_shutdown()
+        await data["token_manager"].async_shutdown()
+        await data["client"].async_close()
+        # Write delayed saves now, a reload reads the files right away
+        await data["cache"].async_flush()
+        await data["history"].async_flush()
+        # Kept so async_remove_entry removes the files through the same stores
+        hass.data.setdefault(UNLOADED_STORES, {})[entry.entry_id] = (data["cache"], data["history"])
         return True
     return False
 
 
+async def async_remove_entry(hass, entry):
+    """Remove the warm-start cache and telemetry history when the config entry is deleted."""
+    stores = hass.data.get(UNLOADED_STORES, {}).pop(entry.entry_id, None)
+    if stores is None:
+        stores = (RaptCacheStore(hass, entry), TelemetryHistory(hass, entry))
+    for store in stores:
+        await store.async_remove()
+
+
 async def update_listener(hass, entry):
-    """Handle options update: reload the integration to apply new polling interval."""
+    """Handle options update: reload the integration to apply the new options."""
     await hass.config_entries.async_reload(entry.entry_id)
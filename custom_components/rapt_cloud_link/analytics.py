@@ -0,0 +1,194 @@
+import math
+from collections import deque
+from datetime import datetime, timezone
+
+from .const import ANALYTICS_NEW_BATCH_RISE, ANALYTICS_SLOPE_WINDOW, ANALYTICS_STABLE_SLOPE
+
+# Standard homebrew approximation, ABV % from the gravity drop in SG
+ABV_FACTOR = 131.25
+
+
+class _SlopeWindow:
+    """Least-squares slope over a sliding time window, kept as running sums.
+
+    Adding a sample and evicting expired ones are O(1) each; only the
+    samples inside the window are held.
+    """
+
+    __slots__ = ("_window", "_samples", "_origin", "_n", "_st", "_sg", "_stt", "_stg")
+
+    def __init__(self, window):
+        self._window = window
+        self._samples = deque()
+        self.reset()
+
+    def reset(self):
+        self._samples.clear()
+        self._origin = None
+        self._n = 0
+        self._st = self._sg = self._stt = self._stg = 0.0
+
+    def add(self, timestamp, gravity):
+        if self._origin is None:
+            # Times are hours since the first sample, keeping the sums small
+            self._origin = timestamp
+        t = (timestamp - self._origin) / 3600
+        self._samples.append((t, gravity))
+        self._accumulate(t, gravity, 1)
+        while self._samples and self._samples[0][0] < t - self._window:
+            old_t, old_g = self._samples.popleft()
+            self._accumulate(old_t, old_g, -1)
+
+    def _accumulate(self, t, g, sign):
+        self._n += sign
+        self._st += sign * t
+        self._sg += sign * g
+        self._stt += sign * t * t
+        self._stg += sign * t * g
+
+    @property
+    def span(self):
+        """Hours covered by the samples in the window."""
+        return self._samples[-1][0] - self._samples[0][0] if self._samples else 0.0
+
+    def slope(self):
+        """Return the gravity slope in SG per hour, or None with too few samples."""
+        if self._n < 3:
+            return None
+        denominator = self._n * self._stt - self._st * self._st
+        if denominator <= 1e-9:
+            return None
+        return (self._n * self._stg - self._st * self._sg) / denominator
+
+
+class PillFermentation:
+    """Rolling fermentation state of one Pill, updated per reading."""
+
+    __slots__ = (
+        "original_gravity",
+        "started",
+        "gravity",
+        "last_sample",
+        "slope",
+        "stable_since",
+        "_window",
+        "_reference_slope",
+        "_reference_time",
+        "_decay",
+    )
+
+    def __init__(self, original_gravity=None, started=None, gravity=None):
+        self.original_gravity = original_gravity
+        self.started = started
+        self.gravity = gravity
+        self.last_sample = None
+        # SG per day, negative while fermenting
+        self.slope = None
+        self.stable_since = None
+        self._window = _SlopeWindow(ANALYTICS_SLOPE_WINDOW.total_seconds() / 3600)
+        # Slope one window ago and the fitted decay rate of the slope (per hour)
+        self._reference_slope = None
+        self._reference_time = None
+        self._decay = None
+
+    def observe(self, timestamp, gravity):
+        """Add one reading (epoch seconds, SG). Returns False if it was already seen."""
+        if self.last_sample is not None and timestamp <= self.last_sample:
+            return False
+        if self.original_gravity is None or (
+            self.gravity is not None and gravity > self.gravity + ANALYTICS_NEW_BATCH_RISE
+        ):
+            # First reading, or the Pill went into a fresh wort
+            self.original_gravity = gravity
+            self.started = timestamp
+            self.stable_since = None
+            self._window.reset()
+            self._reference_slope = self._reference_time = self._decay = None
+        elif gravity > self.original_gravity:
+            self.original_gravity = gravity
+
+        self.gravity = gravity
+        self.last_sample = timestamp
+        self._window.add(timestamp, gravity)
+        slope = self._window.slope()
+        self.slope = None if slope is None else slope * 24
+        self._update_stability(timestamp)
+        return True
+
+    def _update_stability(self, timestamp):
+        # Only judge stability once a full window of samples is in
+        if self.slope is None or self._window.span < ANALYTICS_SLOPE_WINDOW.total_seconds() / 3600 * 0.9:
+            return
+        if abs(self.slope) < ANALYTICS_STABLE_SLOPE:
+            if self.stable_since is None:
+                self.stable_since = timestamp
+        else:
+            self.stable_since = None
+
+        # Fermentation slows roughly exponentially, fit the decay from the slope a window ago
+        window_seconds = ANALYTICS_SLOPE_WINDOW.total_seconds()
+        if self._reference_time is None:
+            self._reference_slope, self._reference_time = self.slope, timestamp
+        elif timestamp - self._reference_time >= window_seconds:
+            previous, current = abs(self._reference_slope), abs(self.slope)
+            if previous > current > 0:
+                self._decay = math.log(previous / current) / ((timestamp - self._reference_time) / 3600)
+            else:
+                self._decay = None
+            self._reference_slope, self._reference_time = self.slope, timestamp
+
+    @property
+    def abv(self):
+        if self.original_gravity is None or self.gravity is None:
+            return None
+        return max(0.0, (self.original_gravity - self.gravity) * ABV_FACTOR)
+
+    @property
+    def attenuation(self):
+        """Apparent attenuation in percent."""
+        if self.original_gravity is None or self.gravity is None or self.original_gravity <= 1:
+            return None
+        return max(0.0, (self.original_gravity - self.gravity) / (self.original_gravity - 1) * 100)
+
+    @property
+    def stable_eta(self):
+        """Expected time the gravity becomes stable (epoch seconds), None if unknown."""
+        if self.stable_since is not None:
+            return self.stable_since
+        if self.slope is None or self._decay is None or self._decay <= 0 or self.slope >= 0:
+            return None
+        hours = math.log(abs(self.slope) / ANALYTICS_STABLE_SLOPE) / self._decay
+        return self.last_sample + hours * 3600
+
+
+class FermentationAnalytics:
+    """Per-Pill fermentation analytics fed by the hydrometer coordinator.
+
+    The original gravity, start and last gravity of each fermentation are kept
+    in the cache store, so ABV, attenuation and new-batch detection survive a
+    restart. The slope and ETA are rebuilt from new readings.
+    """
+
+    def __init__(self, cache=None):
+        self.cache = cache
+        self._pills = {}
+
+    def get(self, device_id):
+        return self._pills.get(device_id)
+
+    def observe(self, device_id, when, gravity):
+        """Feed one reading, when being an aware datetime and gravity in SG."""
+        pill = self._pills.get(device_id)
+        if pill is None:
+            stored = self.cache.get_analytics(device_id) if self.cache is not None else None
+            pill = self._pills[device_id] = PillFermentation(*(stored or ()))
+        if pill.observe(when.timestamp(), gravity) and self.cache is not None:
+            self.cache.async_update_analytics(device_id, pill.original_gravity, pill.started, pill.gravity)
+
+    def forget(self, device_id):
+        self._pills.pop(device_id, None)
+
+
+def as_datetime(timestamp):
+    return None if timestamp is None else datetime.fromtimestamp(timestamp, timezone.utc)
+
@@ -0,0 +1,179 @@
+import logging
+import math
+
+from homeassistant.core import callback
+
+from .const import (
+    ANOMALY_CUSUM_ALLOWANCE,
+    ANOMALY_CUSUM_THRESHOLD,
+    ANOMALY_EWMA_ALPHA,
+    ANOMALY_MIN_DEVIATION,
+    ANOMALY_SETPOINT_GRACE,
+    ANOMALY_STUCK_ATTENUATION,
+    ANOMALY_WARMUP_SAMPLES,
+    ANOMALY_Z_THRESHOLD,
+    EVENT_ANOMALY,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+STUCK_FERMENTATION = "stuck_fermentation"
+TEMPERATURE_ANOMALY = "temperature_anomaly"
+TEMPERATURE_EXCURSION = "temperature_excursion"
+
+
+class _Ewma:
+    """Exponentially weighted running mean and variance."""
+
+    __slots__ = ("mean", "variance", "count")
+
+    def __init__(self):
+        self.mean = None
+        self.variance = 0.0
+        self.count = 0
+
+    def update(self, value):
+        self.count += 1
+        if self.mean is None:
+            self.mean = value
+            return
+        diff = value - self.mean
+        increment = ANOMALY_EWMA_ALPHA * diff
+        self.mean += increment
+        self.variance = (1 - ANOMALY_EWMA_ALPHA) * (self.variance + diff * increment)
+
+
+class _Cusum:
+    """Two-sided CUSUM change-point test on the deviation from a setpoint."""
+
+    __slots__ = ("high", "low")
+
+    def __init__(self):
+        self.high = 0.0
+        self.low = 0.0
+
+    def reset(self):
+        self.high = self.low = 0.0
+
+    def update(self, error):
+        # Capped, so a long excursion still clears soon after the temperature is back
+        cap = ANOMALY_CUSUM_THRESHOLD * 2
+        self.high = min(cap, max(0.0, self.high + error - ANOMALY_CUSUM_ALLOWANCE))
+        self.low = min(cap, max(0.0, self.low - error - ANOMALY_CUSUM_ALLOWANCE))
+        return max(self.high, self.low)
+
+
+class _DeviceState:
+    __slots__ = ("active", "temperature", "cusum", "target", "target_changed")
+
+    def __init__(self):
+        self.active = set()
+        self.temperature = _Ewma()
+        self.cusum = _Cusum()
+        self.target = None
+        self.target_changed = None
+
+
+class AnomalyDetector:
+    """Streaming anomaly detection over one coordinator's readings.
+
+    Each device keeps a few running sums (EWMA mean/variance, CUSUM), so a
+    reading costs O(1) and memory stays constant. Conditions are re-evaluated
+    on every new reading and an EVENT_ANOMALY event is fired only when one
+    starts or clears.
+    """
+
+    def __init__(self, hass, entry):
+        self.hass = hass
+        self.entry = entry
+        self._devices = {}
+
+    def is_active(self, device_id, anomaly):
+        state = self._devices.get(device_id)
+        return state is not None and anomaly in state.active
+
+    def _state(self, device_id):
+        state = self._devices.get(device_id)
+        if state is None:
+            state = self._devices[device_id] = _DeviceState()
+        return state
+
+    def forget(self, device_id):
+        self._devices.pop(device_id, None)
+
+    @callback
+    def observe_pill(self, device, fermentation):
+        """Check a Pill reading for a stalled fermentation or a sudden temperature change."""
+        state = self._state(device.id)
+        if fermentation is not None and fermentation.attenuation is not None:
+            stuck = fermentation.stable_since is not None and fermentation.attenuation < ANOMALY_STUCK_ATTENUATION
+            self._set(device, state, STUCK_FERMENTATION, stuck, attenuation=round(fermentation.attenuation, 1))
+
+        if device.temperature is not None:
+            ewma = state.temperature
+            if ewma.count >= ANOMALY_WARMUP_SAMPLES:
+                deviation = abs(device.temperature - ewma.mean)
+                limit = max(ANOMALY_Z_THRESHOLD * math.sqrt(ewma.variance), ANOMALY_MIN_DEVIATION)
+                if TEMPERATURE_ANOMALY in state.active:
+                    # Hysteresis, clear only once well back inside the band
+                    anomalous = deviation > limit / 2
+                else:
+                    anomalous = deviation > limit
+                self._set(
+                    device,
+                    state,
+                    TEMPERATURE_ANOMALY,
+                    anomalous,
+                    temperature=device.temperature,
+                    expected=round(ewma.mean, 2),
+                )
+            ewma.update(device.temperature)
+
+    @callback
+    def observe_controller(self, device, when):
+        """Check a temperature controller reading for a sustained drift away from its target."""
+        if device.temperature is None or device.target_temperature is None:
+            return
+        state = self._state(device.id)
+        if device.target_temperature != state.target:
+            # A new setpoint takes a while to reach, start over and allow a ramp
+            state.target = device.target_temperature
+            state.target_changed = when
+            state.cusum.reset()
+            self._set(device, state, TEMPERATURE_EXCURSION, False, target_temperature=device.target_temperature)
+        statistic = state.cusum.update(device.temperature - device.target_temperature)
+        if when - state.target_changed < ANOMALY_SETPOINT_GRACE:
+            return
+        if TEMPERATURE_EXCURSION in state.active:
+            excursion = statistic > ANOMALY_CUSUM_THRESHOLD / 2
+        else:
+            excursion = statistic > ANOMALY_CUSUM_THRESHOLD
+        self._set(
+            device,
+            state,
+            TEMPERATURE_EXCURSION,
+            excursion,
+            temperature=device.temperature,
+            target_temperature=device.target_temperature,
+        )
+
+    def _set(self, device, state, anomaly, active, **details):
+        if active == (anomaly in state.active):
+            return
+        if active:
+            state.active.add(anomaly)
+            _LOGGER.warning("%s on %s (%s)", anomaly.replace("_", " ").capitalize(), device.name or device.id, details)
+        else:
+            state.active.discard(anomaly)
+            _LOGGER.info("%s on %s cleared", anomaly.replace("_", " ").capitalize(), device.name or device.id)
+        self.hass.bus.async_fire(
+            EVENT_ANOMALY,
+            {
+                "entry_id": self.entry.entry_id,
+                "device_id": device.id,
+                "device_name": device.name,
+                "anomaly": anomaly,
+                "active": active,
+                **details,
+            },
+        )
@@ -0,0 +1,86 @@
+import logging
+import time
+
+from homeassistant.exceptions import HomeAssistantError
+
+from ..const import (
+    BREAKER_FAILURE_THRESHOLD,
+    BREAKER_RESET_INITIAL,
+    BREAKER_RESET_MAX,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(HomeAssistantError):
+    """Raised instead of sending a request while the RAPT cloud is considered down."""
+
+
+class CircuitBreaker:
+    """Circuit breaker around the RAPT cloud.
+
+    Opens after a run of failed requests. While open, requests fail fast
+    without touching the network or the identity server. Once the reset
+    timeout has passed a single probe request is let through; success closes
+    the breaker, failure reopens it with a doubled timeout.
+    """
+
+    def __init__(
+        self,
+        threshold=BREAKER_FAILURE_THRESHOLD,
+        reset_initial=BREAKER_RESET_INITIAL,
+        reset_max=BREAKER_RESET_MAX,
+    ):
+        self._threshold = threshold
+        self._reset_initial = reset_initial
+        self._reset_max = reset_max
+        self._reset_timeout = reset_initial
+        self.state = STATE_CLOSED
+        self.failures = 0
+        self._open_until = 0.0
+
+    def before_request(self):
+        """Raise CircuitOpenError unless a request may be sent now."""
+        if self.state == STATE_CLOSED:
+            return
+        if self.state == STATE_OPEN and time.monotonic() >= self._open_until:
+            _LOGGER.debug("Circuit half-open, sending probe request")
+            self.state = STATE_HALF_OPEN
+            return
+        raise CircuitOpenError(
+            f"RAPT cloud unavailable, next attempt in {max(0.0, self._open_until - time.monotonic()):.0f} s"
+        )
+
+    def record_success(self):
+        if self.state != STATE_CLOSED:
+            _LOGGER.info("RAPT cloud reachable again, closing circuit")
+        self.state = STATE_CLOSED
+        self.failures = 0
+        self._reset_timeout = self._reset_initial
+
+    def record_failure(self):
+        self.failures += 1
+        if self.state == STATE_HALF_OPEN:
+            self._reset_timeout = min(self._reset_timeout * 2, self._reset_max)
+            self._open()
+        elif self.state == STATE_CLOSED and self.failures >= self._threshold:
+            self._open()
+
+    def abort_probe(self):
+        """Let the next request probe again if the probe ended without an outcome."""
+        if self.state == STATE_HALF_OPEN:
+            self.state = STATE_OPEN
+            self._open_until = time.monotonic()
+
+    def _open(self):
+        self.state = STATE_OPEN
+        self._open_until = time.monotonic() + self._reset_timeout
+        _LOGGER.warning(
+            "RAPT cloud failing (%s errors in a row), pausing requests for %s s",
+            self.failures,
+            self._reset_timeout,
+        )
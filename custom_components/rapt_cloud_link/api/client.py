@@ -0,0 +1,379 @@
+import asyncio
+import logging
+import time
+
+import aiohttp
+from homeassistant.const import EVENT_HOMEASSISTANT_CLOSE
+from homeassistant.util.json import json_loads
+from homeassistant.util.ssl import get_default_context
+
+from ..metrics import RaptMetrics
+from ..profiler import async_get_profiler
+from ..const import (
+    API_BASE_URL,
+    CONF_API_BASE_URL,
+    CONNECTION_LIMIT,
+    DNS_CACHE_TTL,
+    KEEPALIVE_TIMEOUT,
+    REQUEST_TIMEOUT,
+    COMMAND_TIMEOUT,
+    POLL_MAX_RETRIES,
+    COMMAND_MAX_RETRIES,
+    JSON_EXECUTOR_THRESHOLD,
+    GET_FRESHNESS,
+)
+from .circuit_breaker import CircuitBreaker
+from .models import BrewZilla, Hydrometer, TemperatureController, parse_devices, parse_telemetry
+from .scheduler import (
+    PRIORITY_BACKGROUND,
+    PRIORITY_COMMAND,
+    PRIORITY_POLL,
+    async_get_scheduler,
+    backoff_delay,
+    parse_retry_after,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def _decode(body, parse):
+    """Decode JSON with orjson and optionally parse it into models. Safe to run in an executor."""
+    started = time.perf_counter()
+    result = json_loads(body)
+    if parse is not None:
+        result = parse(result)
+    return result, time.perf_counter() - started
+
+
+def _device_parser(model):
+    def parse(records):
+        return parse_devices(records, model)
+
+    return parse
+
+
+def _telemetry_parser(model):
+    def parse(records):
+        return parse_telemetry(records, model)
+
+    return parse
+
+
+class RaptCloudClient:
+    """Shared RAPT cloud client, one per config entry.
+
+    Owns a dedicated aiohttp session with a keep-alive connection pool and DNS
+    cache, so every poll and command reuses warm TLS connections. The auth
+    headers are built once and only swapped when the token rotates. All
+    requests go through the account's RequestScheduler, which rate-limits and
+    lets commands overtake polls; 429, 5xx and timeouts are retried.
+    """
+
+    def __init__(self, hass, token_manager, entry, metrics=None):
+        self.hass = hass
+        self.token_manager = token_manager
+        self.entry = entry
+        self._base_url = entry.data.get(CONF_API_BASE_URL, API_BASE_URL).rstrip("/")
+        self._session = None
+        self._token = None
+        self._get_headers = None
+        self._post_headers = None
+        self._poll_timeout = aiohttp.ClientTimeout(total=REQUEST_TIMEOUT, sock_connect=10)
+        self._command_timeout = aiohttp.ClientTimeout(total=COMMAND_TIMEOUT, sock_connect=10)
+        self._unsub_close = None
+        self.scheduler = async_get_scheduler(hass, token_manager.email)
+        self.breaker = CircuitBreaker()
+        self.metrics = metrics if metrics is not None else RaptMetrics()
+        self.profiler = async_get_profiler(hass)
+        # GET coalescing: shared in-flight requests and recent poll results
+        self._inflight = {}
+        self._recent = {}
+
+    @property
+    def session(self):
+        """Return the pooled session, creating it on first use."""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=CONNECTION_LIMIT,
+                ttl_dns_cache=DNS_CACHE_TTL,
+                keepalive_timeout=KEEPALIVE_TIMEOUT,
+                ssl=get_default_context(),
+            )
+            self._session = aiohttp.ClientSession(connector=connector, raise_for_status=False)
+            if self._unsub_close is None:
+                self._unsub_close = self.hass.bus.async_listen_once(
+                    EVENT_HOMEASSISTANT_CLOSE, self._async_close_on_stop
+                )
+        return self._session
+
+    async def async_close(self):
+        """Close the pooled session."""
+        for task in list(self._inflight.values()):
+            task.cancel()
+        self._inflight.clear()
+        self._recent.clear()
+        if self._unsub_close:
+            self._unsub_close()
+            self._unsub_close = None
+        if self._session and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    async def _async_close_on_stop(self, _event):
+        self._unsub_close = None
+        await self.async_close()
+
+    async def _async_headers(self):
+        """Return prebuilt (get, post) headers for the current token."""
+        token = await self.token_manager.get_token()
+        if token != self._token:
+            self._token = token
+            self._get_headers = {
+                "Authorization": f"Bearer {token}",
+                "Accept": "application/json",
+            }
+            self._post_headers = {
+                "Authorization": f"Bearer {token}",
+                "Content-Type": "application/json",
+            }
+        return self._get_headers, self._post_headers
+
+    def _get_url(self, path: str) -> str:
+        return f"{self._base_url}{path}"
+
+    async def _request(self, method, path, params=None, priority=None, parse=None):
+        """Send a request through the circuit breaker and scheduler.
+
+        Raises CircuitOpenError without touching the network (or the token)
+        while the cloud is considered down.
+        """
+        self.breaker.before_request()
+        try:
+            return await self._send(method, path, params, priority, parse)
+        except BaseException:
+            self.breaker.abort_probe()
+            raise
+
+    async def _send(self, method, path, params, priority, parse):
+        """Send a request, retrying throttling and transient errors.
+
+        GET requests return the decoded JSON body, passed through parse if
+        given, and default to poll priority; POST requests are user commands
+        and return True on HTTP 200.
+        """
+        is_command = method == "POST"
+        if priority is None:
+            priority = PRIORITY_COMMAND if is_command else PRIORITY_POLL
+        timeout = self._command_timeout if is_command else self._poll_timeout
+        max_retries = COMMAND_MAX_RETRIES if is_command else POLL_MAX_RETRIES
+        url = self._get_url(path)
+
+        attempt = 0
+        reauthenticated = False
+        while True:
+            await self.scheduler.acquire(priority)
+            get_headers, post_headers = await self._async_headers()
+            headers = post_headers if is_command else get_headers
+            token = self._token
+            started = time.perf_counter()
+            recorded = False
+            try:
+                async with self.session.request(
+                    method, url, params=params, headers=headers, timeout=timeout
+                ) as resp:
+                    nbytes = 0
+                    try:
+                        if resp.status < 500:
+                            self.breaker.record_success()
+                        if resp.status == 401 and not reauthenticated:
+                            # Token was revoked or expired early, retry once with a fresh one
+                            reauthenticated = True
+                            self.token_manager.invalidate(token)
+                            continue
+                        if resp.status == 429:
+                            delay = parse_retry_after(resp.headers.get("Retry-After"))
+                            self.scheduler.block_for(delay if delay is not None else backoff_delay(attempt))
+                            retry_delay = 0
+                        elif resp.status >= 500:
+                            retry_delay = backoff_delay(attempt)
+                        elif is_command:
+                            if resp.status != 200:
+                                _LOGGER.warning("%s %s failed with status %s", method, path, resp.status)
+                            return resp.status == 200
+                        else:
+                            resp.raise_for_status()
+                            body = await resp.read()
+                            nbytes = len(body)
+                            break
+
+                        if attempt >= max_retries:
+                            _LOGGER.warning("%s %s failed with status %s after %s attempts", method, path, resp.status, attempt + 1)
+                            if resp.status >= 500:
+                                self.breaker.record_failure()
+                            if is_command:
+                                return False
+                            resp.raise_for_status()
+                    finally:
+                        recorded = True
+                        self.metrics.record_request(
+                            path, time.perf_counter() - started, nbytes or resp.content_length or 0, resp.status >= 400
+                        )
+            except (asyncio.TimeoutError, aiohttp.ClientConnectionError) as err:
+                if not recorded:
+                    self.metrics.record_request(path, time.perf_counter() - started, error=True)
+                if attempt >= max_retries:
+                    self.breaker.record_failure()
+                    raise
+                retry_delay = backoff_delay(attempt)
+                _LOGGER.debug("%s %s failed (%s), retrying in %.1f s", method, path, err, retry_delay)
+
+            attempt += 1
+            if retry_delay:
+                await asyncio.sleep(retry_delay)
+
+        return await self._async_decode(path, body, parse)
+
+    async def _async_decode(self, path, body, parse):
+        """Decode (and parse) a response body, off the event loop when it is large."""
+        if len(body) > JSON_EXECUTOR_THRESHOLD:
+            result, elapsed = await self.hass.async_add_executor_job(_decode, body, parse)
+        else:
+            result, elapsed = _decode(body, parse)
+
+        self.metrics.record_decode(path, elapsed)
+        _LOGGER.debug("Decoded %s (%s bytes) in %.1f ms", path, len(body), elapsed * 1000)
+        return result
+
+    async def _get(self, path, params=None, priority=None, parse=None):
+        """GET with coalescing of identical requests.
+
+        Concurrent identical requests share one upstream call, and poll
+        results younger than GET_FRESHNESS are served again without a call.
+        Command-priority reads (confirmations) and background reads (history
+        pages) always go upstream and are not kept.
+        """
+        if priority is None:
+            priority = PRIORITY_POLL
+        key = (path, tuple(sorted(params.items())) if params else ())
+        if priority == PRIORITY_POLL:
+            recent = self._recent.get(key)
+            if recent is not None and time.monotonic() - recent[0] < GET_FRESHNESS:
+                return recent[1]
+
+        task = self._inflight.get(key)
+        if task is None:
+            task = self.hass.async_create_task(self.profiler.wrap(self._async_fetch(key, path, params, priority, parse)))
+            self._inflight[key] = task
+
+            def _done(_):
+                if self._inflight.get(key) is task:
+                    del self._inflight[key]
+
+            task.add_done_callback(_done)
+        # Shield so one cancelled waiter does not abort the request for the others
+        return await asyncio.shield(task)
+
+    async def _async_fetch(self, key, path, params, priority, parse):
+        result = await self._request("GET", path, params, priority, parse)
+        if priority == PRIORITY_POLL:
+            self._recent[key] = (time.monotonic(), result)
+        return result
+
+    async def _post(self, path, params):
+        success = await self._request("POST", path, params)
+        # Device state changed, recent reads no longer describe it
+        self._recent.clear()
+        return success
+
+    # ---------------------
+    # BrewZilla
+    # ---------------------
+    async def get_brewzillas(self):
+        return await self._get("/BrewZillas/GetBrewZillas", parse=_device_parser(BrewZilla))
+
+    async def get_brewzilla(self, device_id):
+        """Fetch and parse one BrewZilla, used to confirm commands. Runs at command priority."""
+        return await self._get(
+            "/BrewZillas/GetBrewZilla",
+            {"brewZillaId": device_id},
+            priority=PRIORITY_COMMAND,
+            parse=BrewZilla.from_api,
+        )
+
+    async def set_heating_enabled(self, device_id, enabled):
+        return await self._post(
+            "/BrewZillas/SetHeatingEnabled",
+            {"brewZillaId": device_id, "state": str(enabled).lower()},
+        )
+
+    async def set_pump_enabled(self, device_id, enabled):
+        return await self._post(
+            "/BrewZillas/SetPumpEnabled",
+            {"brewZillaId": device_id, "state": str(enabled).lower()},
+        )
+
+    async def set_heating_utilization(self, device_id, percent):
+        return await self._post(
+            "/BrewZillas/SetHeatingUtilisation",
+            {"brewZillaId": device_id, "utilisation": percent},
+        )
+
+    async def set_pump_utilization(self, device_id, percent):
+        return await self._post(
+            "/BrewZillas/SetPumpUtilisation",
+            {"brewZillaId": device_id, "utilisation": percent},
+        )
+
+    async def set_brewzilla_target_temperature(self, device_id, temperature):
+        return await self._post(
+            "/BrewZillas/SetTargetTemperature",
+            {"brewZillaId": device_id, "target": temperature},
+        )
+
+    # ---------------------
+    # Hydrometer
+    # ---------------------
+    async def get_hydrometers(self):
+        return await self._get("/Hydrometers/GetHydrometers", parse=_device_parser(Hydrometer))
+
+    async def get_hydrometer_telemetry(self, device_id, start, end):
+        """Fetch a page of Pill history as (timestamp, values) samples. Runs at background priority."""
+        return await self._get(
+            "/Hydrometers/GetTelemetry",
+            {"hydrometerId": device_id, "startDate": start.isoformat(), "endDate": end.isoformat()},
+            priority=PRIORITY_BACKGROUND,
+            parse=_telemetry_parser(Hydrometer),
+        )
+
+    # ---------------------
+    # Temperature Controller
+    # ---------------------
+    async def get_temperature_controllers(self):
+        return await self._get(
+            "/TemperatureControllers/GetTemperatureControllers",
+            parse=_device_parser(TemperatureController),
+        )
+
+    async def get_temperature_controller(self, device_id):
+        """Fetch and parse one temperature controller, used to confirm commands. Runs at command priority."""
+        return await self._get(
+            "/TemperatureControllers/GetTemperatureController",
+            {"temperatureControllerId": device_id},
+            priority=PRIORITY_COMMAND,
+            parse=TemperatureController.from_api,
+        )
+
+    async def get_temperature_controller_telemetry(self, device_id, start, end):
+        """Fetch a page of controller history as (timestamp, values) samples. Runs at background priority."""
+        return await self._get(
+            "/TemperatureControllers/GetTelemetry",
+            {"temperatureControllerId": device_id, "startDate": start.isoformat(), "endDate": end.isoformat()},
+            priority=PRIORITY_BACKGROUND,
+            parse=_telemetry_parser(TemperatureController),
+        )
+
+    async def set_temperature_controller_target_temperature(self, device_id, temperature):
+        return await self._post(
+            "/TemperatureControllers/SetTargetTemperature",
+            {"temperatureControllerId": device_id, "target": temperature},
+        )
@@ -0,0 +1,99 @@
+import asyncio
+import logging
+from collections import deque
+
+from ..const import COMMAND_DEBOUNCE
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class _PendingCommand:
+    __slots__ = ("setting", "value", "due", "future")
+
+    def __init__(self, setting, future):
+        self.setting = setting
+        self.value = None
+        self.due = None
+        self.future = future
+
+
+class CommandQueue:
+    """Coalescing command queue for device writes.
+
+    Each device has a FIFO queue, sent one command at a time in the order the
+    writes were made. A write to the same setting as the last queued one
+    replaces its value and restarts its debounce, so rapid writes to one
+    setting send only the final value. A command waits for the debounce of
+    every command queued before it.
+    """
+
+    def __init__(self, client):
+        self.client = client
+        self._queues = {}
+        self._workers = {}
+
+    async def async_send(self, device_id, setting, value, debounce=COMMAND_DEBOUNCE):
+        """Queue a write of value via the client method named setting.
+
+        Returns the command result for the value that was actually sent, or
+        None when the value was superseded by a later write to the same setting.
+        """
+        loop = asyncio.get_running_loop()
+        queue = self._queues.setdefault(device_id, deque())
+        if queue and queue[-1].setting == setting:
+            pending = queue[-1]
+        else:
+            pending = _PendingCommand(setting, loop.create_future())
+            queue.append(pending)
+        pending.value = value
+        pending.due = loop.time() + debounce
+
+        if device_id not in self._workers:
+            self._workers[device_id] = loop.create_task(self.client.profiler.wrap(self._async_run(device_id)))
+
+        sent_value, result = await asyncio.shield(pending.future)
+        return result if sent_value == value else None
+
+    async def _async_run(self, device_id):
+        """Send the queued commands of one device in order, each once its debounce ran out."""
+        loop = asyncio.get_running_loop()
+        queue = self._queues[device_id]
+        try:
+            while queue:
+                # Writes coalesced into the head push its due time back, so check again after sleeping
+                delay = queue[0].due - loop.time()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                    continue
+                await self._async_execute(device_id, queue.popleft())
+        finally:
+            self._workers.pop(device_id, None)
+            if not queue:
+                self._queues.pop(device_id, None)
+
+    async def _async_execute(self, device_id, pending):
+        try:
+            result = await getattr(self.client, pending.setting)(device_id, pending.value)
+        except asyncio.CancelledError:
+            pending.future.cancel()
+            raise
+        except Exception as err:
+            _LOGGER.error("Command %s(%s) for %s failed: %s", pending.setting, pending.value, device_id, err)
+            if not pending.future.done():
+                pending.future.set_exception(err)
+                # Callers that were cancelled meanwhile never await it, don't log it as unretrieved
+                pending.future.exception()
+            return
+        if not pending.future.done():
+            pending.future.set_result((pending.value, result))
+
+    def async_cancel(self):
+        """Drop queued writes and cancel in-flight ones."""
+        for queue in self._queues.values():
+            for pending in queue:
+                if not pending.future.done():
+                    pending.future.cancel()
+            queue.clear()
+        self._queues.clear()
+        for task in list(self._workers.values()):
+            task.cancel()
@@ -0,0 +1,197 @@
+import logging
+from dataclasses import dataclass, fields, replace
+from datetime import datetime, timezone
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def _float(value):
+    if value is None:
+        return None
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise ValueError(f"expected a number, got {value!r}")
+    return float(value)
+
+
+def _int(value):
+    value = _float(value)
+    return None if value is None else int(value)
+
+
+def _bool(value):
+    if value is None:
+        return None
+    if not isinstance(value, bool):
+        raise ValueError(f"expected a boolean, got {value!r}")
+    return value
+
+
+def _str(value):
+    if value is None:
+        return None
+    if not isinstance(value, str):
+        raise ValueError(f"expected a string, got {value!r}")
+    return value
+
+
+@dataclass(slots=True)
+class RaptDevice:
+    """Fields shared by every RAPT device, parsed from the API JSON.
+
+    API_FIELDS maps attribute names to (API key, converter). Only these
+    fields are kept, everything else in the API response is dropped.
+    """
+
+    id: str
+    name: str | None = None
+    connection_state: str | None = None
+    temperature: float | None = None
+    last_activity_time: str | None = None
+
+    API_FIELDS = {
+        "name": ("name", _str),
+        "connection_state": ("connectionState", _str),
+        "temperature": ("temperature", _float),
+        "last_activity_time": ("lastActivityTime", _str),
+    }
+    # Numeric fields kept in the per-device telemetry history
+    HISTORY_FIELDS = ("temperature",)
+
+    @classmethod
+    def from_api(cls, raw):
+        """Parse one API record, raising ValueError if it is malformed."""
+        if not isinstance(raw, dict):
+            raise ValueError(f"expected an object, got {type(raw).__name__}")
+        device_id = raw.get("id")
+        if not isinstance(device_id, str) or not device_id:
+            raise ValueError("missing device id")
+        values = {}
+        for attr, (key, convert) in cls.API_FIELDS.items():
+            try:
+                values[attr] = convert(raw.get(key))
+            except ValueError as err:
+                raise ValueError(f"{key}: {err}") from None
+        return cls(id=device_id, **values)
+
+    def as_api(self):
+        """Return the device as an API-shaped dict, used for the warm-start cache."""
+        data = {"id": self.id}
+        for attr, (key, _) in self.API_FIELDS.items():
+            data[key] = getattr(self, attr)
+        return data
+
+    def with_api_fields(self, api_fields):
+        """Return a copy with the given API-named fields applied."""
+        changes = {}
+        for attr, (key, convert) in self.API_FIELDS.items():
+            if key in api_fields:
+                changes[attr] = convert(api_fields[key])
+        return replace(self, **changes)
+
+
+@dataclass(slots=True)
+class BrewZilla(RaptDevice):
+    target_temperature: float | None = None
+    heating_enabled: bool | None = None
+    pump_enabled: bool | None = None
+    heating_utilisation: int | None = None
+    pump_utilisation: int | None = None
+
+    API_FIELDS = {
+        **RaptDevice.API_FIELDS,
+        "target_temperature": ("targetTemperature", _float),
+        "heating_enabled": ("heatingEnabled", _bool),
+        "pump_enabled": ("pumpEnabled", _bool),
+        "heating_utilisation": ("heatingUtilisation", _int),
+        "pump_utilisation": ("pumpUtilisation", _int),
+    }
+    HISTORY_FIELDS = ("temperature", "target_temperature", "heating_utilisation", "pump_utilisation")
+
+
+@dataclass(slots=True)
+class Hydrometer(RaptDevice):
+    gravity: float | None = None
+    battery: float | None = None
+
+    API_FIELDS = {
+        **RaptDevice.API_FIELDS,
+        "gravity": ("gravity", _float),
+        "battery": ("battery", _float),
+    }
+    # Attribute name -> key in the GetTelemetry history records
+    TELEMETRY_FIELDS = {"temperature": "temperature", "gravity": "gravity", "battery": "battery"}
+    HISTORY_FIELDS = ("temperature", "gravity", "battery")
+
+
+@dataclass(slots=True)
+class TemperatureController(RaptDevice):
+    target_temperature: float | None = None
+
+    API_FIELDS = {
+        **RaptDevice.API_FIELDS,
+        "target_temperature": ("targetTemperature", _float),
+    }
+    TELEMETRY_FIELDS = {"temperature": "temperature", "target_temperature": "targetTemperature"}
+    HISTORY_FIELDS = ("temperature", "target_temperature")
+
+
+_FIELD_NAMES = {}
+
+
+def field_names(device):
+    """Return the attribute names of a device model."""
+    cls = type(device)
+    names = _FIELD_NAMES.get(cls)
+    if names is None:
+        names = _FIELD_NAMES[cls] = tuple(f.name for f in fields(cls))
+    return names
+
+
+def parse_devices(records, model):
+    """Parse an API device list into {id: model}, skipping malformed records."""
+    if not isinstance(records, list):
+        raise ValueError(f"expected a device list, got {type(records).__name__}")
+    devices = {}
+    for raw in records:
+        try:
+            device = model.from_api(raw)
+        except ValueError as err:
+            _LOGGER.warning("Skipping malformed %s record: %s", model.__name__, err)
+            continue
+        devices[device.id] = device
+    return devices
+
+
+def normalize_gravity(sg):
+    """Return gravity as SG (e.g. 1.012), whatever scale the API reported it in."""
+    if sg is None or sg <= 0:
+        return None
+    while sg > 10:
+        sg /= 10
+    return round(sg, 3)
+
+
+def parse_telemetry(records, model):
+    """Parse a GetTelemetry history page into a sorted list of (timestamp, values).
+
+    timestamp is epoch seconds and values a tuple ordered like
+    model.TELEMETRY_FIELDS, so a page of months of samples stays compact.
+    Records without a readable createdOn or with non-numeric values are skipped.
+    """
+    if not isinstance(records, list):
+        raise ValueError(f"expected a telemetry list, got {type(records).__name__}")
+    keys = tuple(model.TELEMETRY_FIELDS.values())
+    samples = []
+    for raw in records:
+        if not isinstance(raw, dict):
+            continue
+        try:
+            created = datetime.fromisoformat(raw["createdOn"])
+            values = tuple(_float(raw.get(key)) for key in keys)
+        except (KeyError, TypeError, ValueError):
+            continue
+        if created.tzinfo is None:
+            created = created.replace(tzinfo=timezone.utc)
+        samples.append((created.timestamp(), values))
+    samples.sort(key=lambda sample: sample[0])
+    return samples
@@ -0,0 +1,138 @@
+import asyncio
+import heapq
+import itertools
+import logging
+import random
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+from ..const import (
+    DOMAIN,
+    RATE_LIMIT_RATE,
+    RATE_LIMIT_BURST,
+    RATE_LIMIT_COMMAND_RESERVE,
+    RETRY_BACKOFF_BASE,
+    RETRY_BACKOFF_MAX,
+    RETRY_AFTER_MAX,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+PRIORITY_COMMAND = 0
+PRIORITY_POLL = 1
+PRIORITY_BACKGROUND = 2
+
+
+class RequestScheduler:
+    """Token-bucket request budget for one RAPT account.
+
+    Waiters are served in priority order, so user commands overtake queued
+    background polls. Polls also leave a small reserve of tokens untouched so
+    a command can go out immediately even when polling has drained the bucket.
+    Background work such as history backfill only runs on a full bucket, i.e.
+    when the account has been idle. A 429 blocks the whole account until its
+    Retry-After has passed.
+    """
+
+    def __init__(self, rate=RATE_LIMIT_RATE, burst=RATE_LIMIT_BURST, reserve=RATE_LIMIT_COMMAND_RESERVE):
+        self._rate = rate
+        self._capacity = burst
+        self._reserve = reserve
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._waiters = []
+        self._seq = itertools.count()
+        self._timer = None
+
+    @property
+    def blocked_for(self):
+        """Seconds left before the account may send again after a 429."""
+        return max(0.0, self._blocked_until - time.monotonic())
+
+    def block_for(self, seconds):
+        """Stop issuing requests for the given number of seconds."""
+        self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+        _LOGGER.warning("RAPT cloud throttled this account, pausing requests for %.0f s", seconds)
+
+    async def acquire(self, priority=PRIORITY_POLL):
+        """Wait until a request with the given priority may be sent."""
+        if not self._waiters and self._try_take(priority):
+            return
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._seq), future))
+        self._dispatch()
+        await future
+
+    def _refill(self, now):
+        self._tokens = min(self._capacity, self._tokens + (now - self._updated) * self._rate)
+        self._updated = now
+
+    def _needed(self, priority):
+        """Tokens that must be available before a request of this priority may take one."""
+        if priority == PRIORITY_COMMAND:
+            return 1
+        if priority == PRIORITY_POLL:
+            return 1 + self._reserve
+        return self._capacity
+
+    def _try_take(self, priority):
+        now = time.monotonic()
+        if now < self._blocked_until:
+            return False
+        self._refill(now)
+        if self._tokens >= self._needed(priority):
+            self._tokens -= 1
+            return True
+        return False
+
+    def _dispatch(self):
+        """Release as many queued waiters as the budget allows, then re-arm the timer."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        while self._waiters:
+            priority, _, future = self._waiters[0]
+            if future.done():  # cancelled while waiting
+                heapq.heappop(self._waiters)
+                continue
+            if not self._try_take(priority):
+                break
+            heapq.heappop(self._waiters)
+            future.set_result(None)
+        if self._waiters:
+            needed = self._needed(self._waiters[0][0])
+            delay = max(self.blocked_for, (needed - self._tokens) / self._rate, 0.05)
+            self._timer = asyncio.get_running_loop().call_later(delay, self._dispatch)
+
+
+def async_get_scheduler(hass, account):
+    """Return the shared scheduler for an account, creating it on first use."""
+    schedulers = hass.data.setdefault(f"{DOMAIN}_schedulers", {})
+    key = account.strip().lower()
+    if key not in schedulers:
+        schedulers[key] = RequestScheduler()
+    return schedulers[key]
+
+
+def backoff_delay(attempt):
+    """Exponential backoff with full jitter for the given retry attempt (0-based)."""
+    return random.uniform(0, min(RETRY_BACKOFF_MAX, RETRY_BACKOFF_BASE * 2 ** attempt))
+
+
+def parse_retry_after(value):
+    """Parse a Retry-After header (delta seconds or HTTP date) into seconds."""
+    if not value:
+        return None
+    try:
+        seconds = float(value)
+    except ValueError:
+        try:
+            when = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        if when.tzinfo is None:
+            when = when.replace(tzinfo=timezone.utc)
+        seconds = (when - datetime.now(timezone.utc)).total_seconds()
+    return min(max(seconds, 0.0), RETRY_AFTER_MAX)
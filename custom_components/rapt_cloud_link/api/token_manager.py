@@ -1,36 +1,87 @@
+import asyncio
 import logging
-from datetime import datetime, timedelta
+from datetime import timedelta
+from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.event import async_track_point_in_utc_time
+from homeassistant.util import dt as dt_util
 
-from ..const import TOKEN_URL
+from ..profiler import async_get_profiler
+from ..const import (
+    CONF_TOKEN_URL,
+    TOKEN_URL,
+    TOKEN_EXPIRY_MARGIN,
+    TOKEN_RENEW_AHEAD,
+    TOKEN_BACKOFF_INITIAL,
+    TOKEN_BACKOFF_MAX,
+)
 
 
 _LOGGER = logging.getLogger(__name__)
 
 
+class TokenRefreshError(HomeAssistantError):
+    """Raised when no valid token can be obtained."""
+
+
 class TokenManager:
-    def __init__(self, hass, email, api_token, entry):
+    def __init__(self, hass, email, api_token, entry, cache=None, metrics=None):
         self.hass = hass
         self.email = email
         self.api_token = api_token
         self.access_token = None
         self.token_expiry = None  # datetime när token går ut
         self.entry = entry
+        self._refresh_task = None
+        self._unsub_renew = None
+        self._failures = 0
+        self._backoff_until = None
+        self._last_error = None
+        self.cache = cache
+        self.metrics = metrics
+
+        if cache is not None:
+            token, expiry = cache.get_token()
+            if token:
+                self.access_token = token
+                self.token_expiry = expiry
+                self._schedule_renewal(expiry - timedelta(seconds=TOKEN_RENEW_AHEAD))
 
     async def get_token(self):
         """Returnerar giltig token, hämtar ny om gammal eller saknas."""
         if self.access_token is None or self._token_expired():
-            await self._fetch_new_token()
+            await self._async_refresh()
         return self.access_token
 
+    def invalidate(self, token):
+        """Mark token as unusable so the next get_token() fetches a new one.
+
+        Ignored if the token has already been replaced, so a burst of 401s
+        for the same token only causes one refresh.
+        """
+        if token is not None and token == self.access_token:
+            self.token_expiry = None
+            self._backoff_until = None
+
     def _token_expired(self):
         if self.token_expiry is None:
             return True
-        return datetime.utcnow() >= self.token_expiry
+        return dt_util.utcnow() >= self.token_expiry
+
+    async def _async_refresh(self):
+        """Join the in-flight refresh or start one, honouring the failure backoff."""
+        if self._refresh_task is None:
+            if self._backoff_until and dt_util.utcnow() < self._backoff_until:
+                raise TokenRefreshError(
+                    f"Token refresh backing off until {self._backoff_until.isoformat()}: {self._last_error}"
+                )
+            self._refresh_task = self.hass.async_create_task(async_get_profiler(self.hass).wrap(self._fetch_new_token()))
+        # Shield so one cancelled caller does not abort the refresh for everyone else
+        await asyncio.shield(self._refresh_task)
 
     async def _fetch_new_token(self):
         session = async_get_clientsession(self.hass)
-        url = TOKEN_URL
+        url = self.entry.data.get(CONF_TOKEN_URL, TOKEN_URL)
         headers = {"Content-Type": "application/x-www-form-urlencoded"}
         body = {
             "grant_type": "password",
@@ -39,16 +90,61 @@ class TokenManager:
             "password": self.api_token,
         }
         try:
-            resp = await session.post(url, data=body, headers=headers)
-            resp.raise_for_status()
-            data = await resp.json()
+            async with session.post(url, data=body, headers=headers) as resp:
+                resp.raise_for_status()
+                data = await resp.json()
             self.access_token = data.get("access_token")
             expires_in = data.get("expires_in", 3600)  # default 1h
 
             # Sätt expiry 5 min tidigare än faktisk för säkerhets skull
-            self.token_expiry = datetime.utcnow() + timedelta(seconds=expires_in - 300)
+            self.token_expiry = dt_util.utcnow() + timedelta(seconds=expires_in - TOKEN_EXPIRY_MARGIN)
+            self._failures = 0
+            self._backoff_until = None
+            self._last_error = None
+            self._schedule_renewal(self.token_expiry - timedelta(seconds=TOKEN_RENEW_AHEAD))
+            if self.metrics is not None:
+                self.metrics.record_token_refresh(True)
+            if self.cache is not None:
+                self.cache.async_update_token(self.access_token, self.token_expiry)
 
-            _LOGGER.debug(f"Ny token hämtad, giltig i {expires_in} sekunder")
+            _LOGGER.debug("New token fetched, valid for %s seconds", expires_in)
         except Exception as e:
-            _LOGGER.error(f"Misslyckades att hämta token: {e}")
-            raise
\ No newline at end of file
+            if self.metrics is not None:
+                self.metrics.record_token_refresh(False)
+            self._failures += 1
+            self._last_error = e
+            delay = min(TOKEN_BACKOFF_INITIAL * 2 ** (self._failures - 1), TOKEN_BACKOFF_MAX)
+            self._backoff_until = dt_util.utcnow() + timedelta(seconds=delay)
+            _LOGGER.error("Failed to fetch token (attempt %s, next try in %s s): %s", self._failures, delay, e)
+            # Keep trying in the background while the current token is still usable
+            if self.access_token is not None and not self._token_expired():
+                self._schedule_renewal(self._backoff_until)
+            raise
+        finally:
+            self._refresh_task = None
+
+    def _schedule_renewal(self, when):
+        """Renew the token in the background at the given point in time."""
+        self._cancel_renewal()
+        when = max(when, dt_util.utcnow() + timedelta(seconds=TOKEN_BACKOFF_INITIAL))
+        self._unsub_renew = async_track_point_in_utc_time(self.hass, self._async_renew, when)
+
+    def _cancel_renewal(self):
+        if self._unsub_renew:
+            self._unsub_renew()
+            self._unsub_renew = None
+
+    async def _async_renew(self, _now):
+        """Proactively renew the token before it expires."""
+        self._unsub_renew = None
+        try:
+            await self._async_refresh()
+        except Exception:  # already logged, renewal is rescheduled on failure
+            pass
+
+    async def async_shutdown(self):
+        """Cancel scheduled renewal and any in-flight refresh."""
+        self._cancel_renewal()
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+            self._refresh_task = None
@@ -0,0 +1,109 @@
+import asyncio
+import logging
+from datetime import timedelta
+
+from aiohttp import ClientResponseError
+from homeassistant.util import dt as dt_util
+
+from .const import BACKFILL_CHUNK, BACKFILL_INTERVAL
+from .statistics import HourlyBuckets, async_import_statistics, normalize_value
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def _hour_floor(when):
+    return when.replace(minute=0, second=0, microsecond=0)
+
+
+class TelemetryBackfill:
+    """Import RAPT telemetry history into long-term statistics.
+
+    Pages through each device's history in BACKFILL_CHUNK windows, from the
+    saved cursor (or days back on first run) up to the last full hour, and
+    imports hourly mean/min/max as external statistics. Only one page is held
+    in memory at a time and the cursor is saved after every page, so a restart
+    resumes where it stopped. Requests run at background priority and only go
+    out while the account is otherwise idle. Once caught up it runs again every
+    BACKFILL_INTERVAL, which also fills gaps left while Home Assistant was down.
+
+    With until set, hours from then on are left to the downsampled live
+    statistics, which also move the cursor past the hours they write.
+    A device or endpoint answering with a client error is not asked again
+    until the entry is reloaded.
+    """
+
+    def __init__(self, hass, entry, cache, days, sources, until=None):
+        self.hass = hass
+        self.entry = entry
+        self.cache = cache
+        self.days = days
+        # (coordinator, fetch(device_id, start, end)) pairs
+        self.sources = sources
+        self.until = until
+        self._skipped_sources = set()
+        self._skipped_devices = set()
+
+    async def async_run(self):
+        while True:
+            for index, (coordinator, fetch) in enumerate(self.sources):
+                for device_id in list(coordinator.data or {}):
+                    if index in self._skipped_sources:
+                        break
+                    if device_id in self._skipped_devices:
+                        continue
+                    try:
+                        await self._async_backfill_device(coordinator, fetch, device_id)
+                    except ClientResponseError as err:
+                        if err.status in (404, 405, 410):
+                            _LOGGER.warning(
+                                "Telemetry history not available for %s (%s), not backfilling it",
+                                coordinator.name,
+                                err.status,
+                            )
+                            self._skipped_sources.add(index)
+                        else:
+                            _LOGGER.warning("Telemetry history of %s refused (%s), not backfilling it", device_id, err.status)
+                            self._skipped_devices.add(device_id)
+            await asyncio.sleep(BACKFILL_INTERVAL.total_seconds())
+
+    async def _async_backfill_device(self, coordinator, fetch, device_id):
+        """Import one device's missing hours. Raises ClientResponseError on a client error response."""
+        fields = tuple(coordinator.model.TELEMETRY_FIELDS)
+        limit = _hour_floor(dt_util.utcnow())
+        if self.until is not None:
+            limit = min(limit, self.until)
+        cursor = self.cache.get_backfill_cursor(device_id) or _hour_floor(limit - timedelta(days=self.days))
+        if cursor < limit:
+            _LOGGER.debug("Backfilling %s from %s", device_id, cursor.isoformat())
+
+        while cursor < limit:
+            end = min(cursor + BACKFILL_CHUNK, limit)
+            try:
+                samples = await fetch(device_id, cursor, end)
+            except ClientResponseError as err:
+                if 400 <= err.status < 500 and err.status != 429:
+                    raise
+                _LOGGER.debug("Telemetry backfill of %s stopped at %s: %s", device_id, cursor.isoformat(), err)
+                return
+            except Exception as err:
+                # Try again on the next round, polls keep working meanwhile
+                _LOGGER.debug("Telemetry backfill of %s stopped at %s: %s", device_id, cursor.isoformat(), err)
+                return
+
+            start_ts, end_ts = cursor.timestamp(), end.timestamp()
+            buckets = [HourlyBuckets() for _ in fields]
+            for timestamp, values in samples:
+                if start_ts <= timestamp < end_ts:
+                    for field, field_buckets, value in zip(fields, buckets, values):
+                        field_buckets.add(timestamp, normalize_value(field, value))
+            del samples
+
+            device = (coordinator.data or {}).get(device_id)
+            name = device.name if device else None
+            for field, field_buckets in zip(fields, buckets):
+                rows = field_buckets.pop_complete(end_ts)
+                if rows:
+                    async_import_statistics(self.hass, self.entry, device_id, name, field, rows)
+
+            cursor = end
+            self.cache.async_update_backfill_cursor(device_id, cursor)
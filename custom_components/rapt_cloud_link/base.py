@@ -1,16 +1,24 @@
 # base.py
+import time
+
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
+from homeassistant.components.binary_sensor import BinarySensorEntity
 from homeassistant.components.sensor import SensorEntity
 from homeassistant.components.number import NumberEntity
 from homeassistant.components.switch import SwitchEntity
-from .const import DOMAIN
+from .const import DOMAIN, DOWNSAMPLE_STATE_INTERVAL
 
 
 class BaseRaptEntity(CoordinatorEntity):
     """Base class for all RAPT entities."""
+
+    # Device fields the entity state is derived from, None means any field
+    _source_fields = None
+
     def __init__(self, coordinator, device_id, device_name=None, model="RAPT"):
         super().__init__(coordinator)
-        device_name = coordinator.data.get(device_id, {}).get("name", f"Device {device_id}")
+        device = coordinator.data.get(device_id)
+        device_name = device.name if device and device.name else f"Device {device_id}"
         self._device_id = device_id
         self._device_name = device_name
         self._attr_device_info = {
@@ -19,9 +27,13 @@ class BaseRaptEntity(CoordinatorEntity):
             "manufacturer": "RAPT",
             "model": model,
         }
+        self._last_available = None
+        self._last_stale = None
 
     async def async_added_to_hass(self):
         """Subscribe to coordinator updates when added to hass."""
+        self._last_available = self.coordinator.last_update_success
+        self._last_stale = self.coordinator.stale
         self._unsub = self.coordinator.async_add_listener(self._handle_coordinator_update)
 
     async def async_will_remove_from_hass(self):
@@ -29,18 +41,98 @@ class BaseRaptEntity(CoordinatorEntity):
         if hasattr(self, "_unsub") and self._unsub:
             self._unsub()
 
+    @property
+    def extra_state_attributes(self):
+        """Flag cached or last-known values until the next successful refresh."""
+        if self.coordinator.stale:
+            return {"stale": True, "stale_since": self.coordinator.stale_since.isoformat()}
+        return None
+
+    def _device_value(self, field, default=None):
+        """Return a field of this entity's device, or default if missing or unknown."""
+        device = self.coordinator.data.get(self._device_id)
+        if device is None:
+            return default
+        value = getattr(device, field)
+        return default if value is None else value
+
+    def _async_apply_optimistic(self, field, value):
+        """Patch coordinator data after a successful command and ask the device to confirm it."""
+        device = self.coordinator.data.get(self._device_id)
+        if device:
+            previous = getattr(device, field)
+            setattr(device, field, value)
+            self.coordinator.async_confirm(self._device_id, field, value, previous)
+        self.async_write_ha_state()
+
+    def _source_changed(self):
+        """Return True if the last coordinator update touched this entity's fields."""
+        changed = self.coordinator.changes.get(self._device_id)
+        if not changed:
+            return False
+        return self._source_fields is None or not changed.isdisjoint(self._source_fields)
+
     def _handle_coordinator_update(self):
-        """Update state when coordinator data changes."""
+        """Update state only when availability, staleness or a source field changed."""
+        available = self.coordinator.last_update_success
+        stale = self.coordinator.stale
+        if available == self._last_available and stale == self._last_stale and not self._source_changed():
+            return
+        self._last_available = available
+        self._last_stale = stale
         self.async_write_ha_state()
 
 
 class BaseRaptSensor(BaseRaptEntity, SensorEntity):
     """Base class for RAPT sensors."""
+
+    # Downsampled mode: smallest change of native_value that is written right away,
+    # None writes every change
+    _significant_change = None
+    # Device field whose long-term statistics are written by the downsampler instead
+    _statistic_field = None
+
     def __init__(self, coordinator, device_id, name_suffix, unique_suffix, unit=None, model="RAPT"):
         super().__init__(coordinator, device_id, model=model)
         self._attr_name = name_suffix
         self._attr_unique_id = f"{device_id}_{unique_suffix}"
         self._attr_native_unit_of_measurement = unit
+        self._written_value = None
+        self._written_at = None
+
+    @property
+    def state_class(self):
+        if self._statistic_field is not None and self.coordinator.downsampler is not None:
+            # No recorder statistics from states, the external statistics replace them
+            return None
+        return super().state_class
+
+    def _source_changed(self):
+        """In downsampled mode, only count a significant change or one after DOWNSAMPLE_STATE_INTERVAL."""
+        if not super()._source_changed():
+            return False
+        if self._significant_change is None or self.coordinator.downsampler is None:
+            return True
+        value = self.native_value
+        now = time.monotonic()
+        if (
+            value is None
+            or self._written_value is None
+            or abs(value - self._written_value) >= self._significant_change
+            or now - self._written_at >= DOWNSAMPLE_STATE_INTERVAL.total_seconds()
+        ):
+            self._written_value = value
+            self._written_at = now
+            return True
+        return False
+
+
+class BaseRaptBinarySensor(BaseRaptEntity, BinarySensorEntity):
+    """Base class for RAPT binary sensors."""
+    def __init__(self, coordinator, device_id, name_suffix, unique_suffix, model="RAPT"):
+        super().__init__(coordinator, device_id, model=model)
+        self._attr_name = name_suffix
+        self._attr_unique_id = f"{device_id}_{unique_suffix}"
 
 
 class BaseRaptNumber(BaseRaptEntity, NumberEntity):
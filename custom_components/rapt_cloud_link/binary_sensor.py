@@ -0,0 +1,80 @@
+import logging
+from homeassistant.core import HomeAssistant
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.components.binary_sensor import BinarySensorDeviceClass
+from .anomaly import STUCK_FERMENTATION, TEMPERATURE_ANOMALY, TEMPERATURE_EXCURSION
+from .const import DOMAIN
+from .base import BaseRaptBinarySensor
+
+_LOGGER = logging.getLogger(__name__)
+
+
+async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_entities):
+    hydrometer_coordinator = hass.data[DOMAIN][entry.entry_id]["hydrometer_coordinator"]
+    temperature_controller_coordinator = hass.data[DOMAIN][entry.entry_id]["temperature_controller_coordinator"]
+
+    binary_sensors = []
+
+    # Hydrometer
+    for device_id in hydrometer_coordinator.data:
+        binary_sensors.append(HydrometerStuckFermentationSensor(hydrometer_coordinator, device_id))
+        binary_sensors.append(HydrometerTemperatureAnomalySensor(hydrometer_coordinator, device_id))
+
+    # Temperature Controller
+    for device_id in temperature_controller_coordinator.data:
+        binary_sensors.append(TemperatureControllerExcursionSensor(temperature_controller_coordinator, device_id))
+
+    if binary_sensors:
+        async_add_entities(binary_sensors, update_before_add=False)
+
+
+class RaptAnomalySensor(BaseRaptBinarySensor):
+    """Binary sensor that is on while the coordinator's detector reports an anomaly."""
+    _anomaly = None
+
+    def __init__(self, coordinator, device_id: str, model, name_suffix):
+        super().__init__(
+            coordinator,
+            device_id,
+            model=model,
+            name_suffix=name_suffix,
+            unique_suffix=self._anomaly
+        )
+        self._attr_device_class = BinarySensorDeviceClass.PROBLEM
+
+    @property
+    def is_on(self):
+        return self.coordinator.anomalies.is_active(self._device_id, self._anomaly)
+
+
+# ---------------------
+# Hydrometer
+# ---------------------
+class HydrometerStuckFermentationSensor(RaptAnomalySensor):
+    """On when the gravity has stopped dropping well short of the expected attenuation."""
+    _anomaly = STUCK_FERMENTATION
+    _source_fields = ("gravity", "last_activity_time")
+
+    def __init__(self, coordinator, device_id: str):
+        super().__init__(coordinator, device_id, "Hydrometer", "Stuck Fermentation")
+
+
+class HydrometerTemperatureAnomalySensor(RaptAnomalySensor):
+    """On when the Pill temperature jumps away from its recent trend."""
+    _anomaly = TEMPERATURE_ANOMALY
+    _source_fields = ("temperature",)
+
+    def __init__(self, coordinator, device_id: str):
+        super().__init__(coordinator, device_id, "Hydrometer", "Temperature Anomaly")
+
+
+# ---------------------
+# Temperature Controller
+# ---------------------
+class TemperatureControllerExcursionSensor(RaptAnomalySensor):
+    """On when the controller keeps drifting away from its target temperature."""
+    _anomaly = TEMPERATURE_EXCURSION
+    _source_fields = ("temperature", "target_temperature")
+
+    def __init__(self, coordinator, device_id: str):
+        super().__init__(coordinator, device_id, "Temperature Controller", "Temperature Excursion")
@@ -5,7 +5,25 @@ from homeassistant.helpers.aiohttp_client import async_get_clientsession
 import voluptuous as vol
 from homeassistant.helpers import config_validation as cv
 from aiohttp import ClientResponseError
-from .const import CONF_TEMPERATURE_UNIT, DEFAULT_TEMPERATURE_UNIT, TOKEN_URL, DOMAIN
+from .const import (
+    API_BASE_URL,
+    CONF_API_BASE_URL,
+    CONF_BACKFILL_DAYS,
+    CONF_DOWNSAMPLE,
+    CONF_MAX_POLL_INTERVAL,
+    CONF_MIN_POLL_INTERVAL,
+    CONF_POLL_INTERVAL,
+    CONF_TEMPERATURE_UNIT,
+    CONF_TOKEN_URL,
+    DEFAULT_BACKFILL_DAYS,
+    DEFAULT_DOWNSAMPLE,
+    DEFAULT_MAX_POLL_INTERVAL,
+    DEFAULT_MIN_POLL_INTERVAL,
+    DEFAULT_POLL_INTERVAL,
+    DEFAULT_TEMPERATURE_UNIT,
+    TOKEN_URL,
+    DOMAIN,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -14,32 +32,44 @@ class ConfigFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
     VERSION = 1
     CONNECTION_CLASS = config_entries.CONN_CLASS_CLOUD_POLL
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry):
+        return OptionsFlowHandler()
+
     async def async_step_user(self, user_input=None):
         errors = {}
 
         if user_input is not None:
             email = user_input.get("email")
             api_token = user_input.get("api_token")
+            token_url = user_input.get(CONF_TOKEN_URL, TOKEN_URL)
 
-            if await self._validate_credentials(email, api_token):
-                return self.async_create_entry(
-                    title=email,
-                    data={
-                        "email": email,
-                        "api_token": api_token,
-                        CONF_TEMPERATURE_UNIT: user_input.get(CONF_TEMPERATURE_UNIT, DEFAULT_TEMPERATURE_UNIT),
-                    },
-                )
+            if await self._validate_credentials(email, api_token, token_url):
+                data = {
+                    "email": email,
+                    "api_token": api_token,
+                    CONF_TEMPERATURE_UNIT: user_input.get(CONF_TEMPERATURE_UNIT, DEFAULT_TEMPERATURE_UNIT),
+                }
+                # Only store overrides, so entries keep following the defaults in const.py
+                if user_input.get(CONF_API_BASE_URL, API_BASE_URL) != API_BASE_URL:
+                    data[CONF_API_BASE_URL] = user_input[CONF_API_BASE_URL]
+                if token_url != TOKEN_URL:
+                    data[CONF_TOKEN_URL] = token_url
+                return self.async_create_entry(title=email, data=data)
             else:
                 errors["base"] = "auth_failed"
 
-        data_schema = vol.Schema(
-            {
-                vol.Required("email"): cv.string,
-                vol.Required("api_token"): cv.string,
-                vol.Optional(CONF_TEMPERATURE_UNIT, default=DEFAULT_TEMPERATURE_UNIT): vol.In(["C", "F"]),
-            }
-        )
+        schema = {
+            vol.Required("email"): cv.string,
+            vol.Required("api_token"): cv.string,
+            vol.Optional(CONF_TEMPERATURE_UNIT, default=DEFAULT_TEMPERATURE_UNIT): vol.In(["C", "F"]),
+        }
+        if self.show_advanced_options:
+            # Point the entry at another cloud, e.g. a local mock for offline testing
+            schema[vol.Optional(CONF_API_BASE_URL, default=API_BASE_URL)] = cv.url
+            schema[vol.Optional(CONF_TOKEN_URL, default=TOKEN_URL)] = cv.url
+        data_schema = vol.Schema(schema)
 
         return self.async_show_form(
             step_id="user",
@@ -48,10 +78,9 @@ class ConfigFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
         )
 
     # Validate credentials against the API
-    async def _validate_credentials(self, email: str, token: str) -> bool:
+    async def _validate_credentials(self, email: str, token: str, url: str = TOKEN_URL) -> bool:
         """Attempt to authenticate against the API with email and token."""
         session = async_get_clientsession(self.hass)
-        url = TOKEN_URL
         headers = {"Content-Type": "application/x-www-form-urlencoded"}
 
         body = {
@@ -76,3 +105,43 @@ class ConfigFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
         except Exception as e:
             _LOGGER.error(f"Unexpected error during authentication: {e}")
             return False
+
+
+class OptionsFlowHandler(config_entries.OptionsFlow):
+    """Polling and statistics options. Saving them reloads the entry."""
+
+    async def async_step_init(self, user_input=None):
+        errors = {}
+
+        if user_input is not None:
+            if user_input[CONF_MIN_POLL_INTERVAL] > user_input[CONF_MAX_POLL_INTERVAL] * 60:
+                errors["base"] = "invalid_poll_bounds"
+            else:
+                return self.async_create_entry(title="", data=user_input)
+
+        options = self.config_entry.options
+        data_schema = vol.Schema(
+            {
+                vol.Optional(
+                    CONF_POLL_INTERVAL, default=options.get(CONF_POLL_INTERVAL, DEFAULT_POLL_INTERVAL)
+                ): vol.All(vol.Coerce(int), vol.Range(min=1, max=60)),
+                vol.Optional(
+                    CONF_MIN_POLL_INTERVAL, default=options.get(CONF_MIN_POLL_INTERVAL, DEFAULT_MIN_POLL_INTERVAL)
+                ): vol.All(vol.Coerce(int), vol.Range(min=5, max=3600)),
+                vol.Optional(
+                    CONF_MAX_POLL_INTERVAL, default=options.get(CONF_MAX_POLL_INTERVAL, DEFAULT_MAX_POLL_INTERVAL)
+                ): vol.All(vol.Coerce(int), vol.Range(min=1, max=1440)),
+                vol.Optional(
+                    CONF_BACKFILL_DAYS, default=options.get(CONF_BACKFILL_DAYS, DEFAULT_BACKFILL_DAYS)
+                ): vol.All(vol.Coerce(int), vol.Range(min=0, max=365)),
+                vol.Optional(
+                    CONF_DOWNSAMPLE, default=options.get(CONF_DOWNSAMPLE, DEFAULT_DOWNSAMPLE)
+                ): cv.boolean,
+            }
+        )
+
+        return self.async_show_form(
+            step_id="init",
+            data_schema=data_schema,
+            errors=errors,
+        )
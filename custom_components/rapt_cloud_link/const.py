@@ -1,9 +1,125 @@
+from datetime import timedelta
+
 DOMAIN = "rapt_cloud_link"
 
 API_BASE_URL = "https://api.rapt.io/api"
 TOKEN_URL = "https://id.rapt.io/connect/token"
-# API_BASE_URL = "https://mock-api.birgell.se/rapt-cloud-link/api"
-# TOKEN_URL = "https://mock-api.birgell.se/rapt-cloud-link/connect/token"
+
+# Per-entry overrides of the URLs above, e.g. to run against tools/mock_rapt_cloud.py
+CONF_API_BASE_URL = "api_base_url"
+CONF_TOKEN_URL = "token_url"
 
 CONF_TEMPERATURE_UNIT = "temperature_unit"
 DEFAULT_TEMPERATURE_UNIT = "C"
+
+# HTTP client tuning (seconds / connection counts)
+CONNECTION_LIMIT = 10
+DNS_CACHE_TTL = 300
+KEEPALIVE_TIMEOUT = 240
+REQUEST_TIMEOUT = 30
+COMMAND_TIMEOUT = 15
+
+# Token handling (seconds)
+TOKEN_EXPIRY_MARGIN = 300
+TOKEN_RENEW_AHEAD = 60
+TOKEN_BACKOFF_INITIAL = 30
+TOKEN_BACKOFF_MAX = 900
+
+# Warm-start cache
+CACHE_SAVE_DELAY = 30
+
+# Request scheduling per account: token bucket (requests/second, burst),
+# tokens kept back for commands, and retry backoff (seconds)
+RATE_LIMIT_RATE = 0.5
+RATE_LIMIT_BURST = 6
+RATE_LIMIT_COMMAND_RESERVE = 2
+POLL_MAX_RETRIES = 3
+COMMAND_MAX_RETRIES = 2
+RETRY_BACKOFF_BASE = 1
+RETRY_BACKOFF_MAX = 30
+RETRY_AFTER_MAX = 300
+
+# Seconds to wait for further writes to the same setting before sending
+COMMAND_DEBOUNCE = 0.75
+
+# Seconds between single-device confirmation refreshes after a command
+CONFIRM_DELAYS = (2, 5, 10)
+
+# Normal poll interval in minutes
+CONF_POLL_INTERVAL = "poll_interval"
+DEFAULT_POLL_INTERVAL = 3
+
+# Adaptive polling bounds: minimum in seconds, maximum in minutes
+CONF_MIN_POLL_INTERVAL = "min_poll_interval"
+CONF_MAX_POLL_INTERVAL = "max_poll_interval"
+DEFAULT_MIN_POLL_INTERVAL = 15
+DEFAULT_MAX_POLL_INTERVAL = 30
+RECENT_TELEMETRY_WINDOW = timedelta(minutes=20)
+
+# Endpoints with no devices fall back to a slow discovery cadence
+EMPTY_POLLS_BEFORE_DISCOVERY = 3
+DISCOVERY_INTERVAL = timedelta(hours=1)
+
+# Pill report alignment: ignore report gaps shorter than this (seconds), and
+# poll this long after the expected report time
+PILL_MIN_REPORT_PERIOD = 60
+PILL_REPORT_GRACE = timedelta(seconds=30)
+
+# Webhook push: while every device of a type pushed within the window, poll only as a consistency check
+WEBHOOK_ACTIVE_WINDOW = timedelta(hours=1)
+WEBHOOK_POLL_INTERVAL = timedelta(minutes=30)
+
+# Response bodies larger than this (bytes) are decoded in an executor
+JSON_EXECUTOR_THRESHOLD = 64 * 1024
+
+# Seconds a GET result is reused for identical poll requests
+GET_FRESHNESS = 2
+
+# Circuit breaker: failed requests before opening, reset timeout bounds (seconds),
+# and how long the last snapshot is served as stale before entities go unavailable
+BREAKER_FAILURE_THRESHOLD = 3
+BREAKER_RESET_INITIAL = 60
+BREAKER_RESET_MAX = 1800
+STALE_MAX_AGE = timedelta(hours=2)
+
+# History backfill into long-term statistics
+CONF_BACKFILL_DAYS = "backfill_days"
+DEFAULT_BACKFILL_DAYS = 0  # off unless set in the options
+BACKFILL_CHUNK = timedelta(days=2)
+BACKFILL_INTERVAL = timedelta(hours=1)
+
+# Downsampled mode: live readings are written as hourly external statistics and
+# measurement sensors only write state on a significant change or once per interval
+CONF_DOWNSAMPLE = "downsample"
+DEFAULT_DOWNSAMPLE = False
+DOWNSAMPLE_STATE_INTERVAL = timedelta(minutes=30)
+DOWNSAMPLE_TEMPERATURE_CHANGE = 0.5  # degrees
+DOWNSAMPLE_GRAVITY_CHANGE = 0.002  # SG
+DOWNSAMPLE_PERCENT_CHANGE = 1.0
+DOWNSAMPLE_ABV_CHANGE = 0.1
+
+# Fermentation analytics (gravity in SG)
+ANALYTICS_SLOPE_WINDOW = timedelta(hours=24)
+ANALYTICS_STABLE_SLOPE = 0.001  # SG per day
+ANALYTICS_NEW_BATCH_RISE = 0.010
+
+# Anomaly detection
+EVENT_ANOMALY = f"{DOMAIN}_anomaly"
+ANOMALY_STUCK_ATTENUATION = 60  # percent, a stable gravity below this is a stuck fermentation
+ANOMALY_EWMA_ALPHA = 0.1
+ANOMALY_WARMUP_SAMPLES = 10
+ANOMALY_Z_THRESHOLD = 4
+ANOMALY_MIN_DEVIATION = 1.0  # degrees
+ANOMALY_CUSUM_ALLOWANCE = 0.5  # degrees of drift from the target that are tolerated
+ANOMALY_CUSUM_THRESHOLD = 5.0  # degree-readings accumulated beyond the allowance
+ANOMALY_SETPOINT_GRACE = timedelta(hours=2)
+
+# Per-device telemetry ring buffer
+HISTORY_CAPACITY = 1440  # samples per device
+HISTORY_SAVE_DELAY = 300  # seconds
+SERVICE_GET_HISTORY = "get_history"
+
+# Profiling service (seconds)
+SERVICE_PROFILE = "profile"
+PROFILE_DEFAULT_DURATION = 60
+PROFILE_MAX_DURATION = 3600
@@ -1,30 +1,382 @@
+import asyncio
 import logging
-from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+import time
+from homeassistant.core import callback
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
 from datetime import timedelta
 
+from ..api.command_queue import CommandQueue
+from ..api.models import field_names, parse_devices
+from ..const import (
+    CONFIRM_DELAYS,
+    CONF_MIN_POLL_INTERVAL,
+    CONF_MAX_POLL_INTERVAL,
+    DEFAULT_MIN_POLL_INTERVAL,
+    DEFAULT_MAX_POLL_INTERVAL,
+    DISCOVERY_INTERVAL,
+    EMPTY_POLLS_BEFORE_DISCOVERY,
+    RECENT_TELEMETRY_WINDOW,
+    STALE_MAX_AGE,
+    WEBHOOK_ACTIVE_WINDOW,
+    WEBHOOK_POLL_INTERVAL,
+)
+
 _LOGGER = logging.getLogger(__name__)
 
+# Activity levels used by the adaptive polling scheduler
+ACTIVITY_IDLE = 0
+ACTIVITY_NORMAL = 1
+ACTIVITY_ACTIVE = 2
+
+
+def parse_timestamp(value):
+    """Parse an API timestamp into an aware UTC datetime, or None."""
+    if not value:
+        return None
+    try:
+        parsed = dt_util.parse_datetime(value)
+    except ValueError:
+        # Well-formed but impossible, e.g. month 13
+        return None
+    if parsed is None:
+        return None
+    if parsed.tzinfo is None:
+        return parsed.replace(tzinfo=dt_util.UTC)
+    return dt_util.as_utc(parsed)
+
+
+def values_match(actual, expected):
+    """Compare a reported device value with a commanded one, tolerating float rounding."""
+    if isinstance(expected, float) and isinstance(actual, (int, float)) and not isinstance(actual, bool):
+        return abs(actual - expected) < 0.05
+    return actual == expected
+
+
+def diff_snapshots(old, new):
+    """Return {device_id: frozenset(changed fields)} between two coordinator snapshots."""
+    old = old or {}
+    changes = {}
+    for device_id, device in new.items():
+        previous = old.get(device_id)
+        if previous is None:
+            changes[device_id] = frozenset(field_names(device))
+            continue
+        changed = frozenset(
+            name for name in field_names(device) if getattr(previous, name) != getattr(device, name)
+        )
+        if changed:
+            changes[device_id] = changed
+    for device_id in old.keys() - new.keys():
+        changes[device_id] = frozenset(field_names(old[device_id]))
+    return changes
+
 
 class BaseRaptCoordinator(DataUpdateCoordinator):
     """Base class for all RAPT coordinators."""
 
-    def __init__(self, hass, token_manager, update_interval: timedelta, entry, name: str):
+    cache_key = None  # to be set by subclass
+    model = None  # device model class, to be set by subclass
+
+    def __init__(self, hass, client, update_interval: timedelta, entry, name: str, cache=None, history=None, downsampler=None):
         super().__init__(
             hass,
             _LOGGER,
+            config_entry=entry,
             name=name,
             update_interval=update_interval,
         )
         self.hass = hass
-        self.token_manager = token_manager
         self.entry = entry
-        self.api = None  # to be instantiated by subclass
+        self.api = client
+        self.commands = CommandQueue(client)
+        self.cache = cache
+        self.history = history
+        # Set in downsampled mode, see statistics.DownsampledStatistics
+        self.downsampler = downsampler
+        # Set while data is a cached or last-known snapshot rather than a live poll
+        self.stale_since = None
+        # Per-device changed fields of the update currently being dispatched
+        self.changes = {}
+        self._delta_listeners = []
+        self._confirmations = {}
+        # Adaptive polling: poll_interval is the normal cadence, clamped to the bounds
+        self.min_interval = timedelta(seconds=entry.options.get(CONF_MIN_POLL_INTERVAL, DEFAULT_MIN_POLL_INTERVAL))
+        self.max_interval = timedelta(minutes=entry.options.get(CONF_MAX_POLL_INTERVAL, DEFAULT_MAX_POLL_INTERVAL))
+        self.base_interval = min(max(update_interval, self.min_interval), self.max_interval)
+        self.update_interval = self.base_interval
+        # Devices entities were created for, and the run of empty responses
+        self.known_devices = None
+        self._empty_polls = 0
+        # Time of the last webhook push per device, polling slows down while every device pushes
+        self.pushes = {}
+
+    async def _async_refresh(self, *args, **kwargs):
+        """Refresh and record its duration in the entry metrics."""
+        started = time.perf_counter()
+        try:
+            await self.api.profiler.wrap(super()._async_refresh(*args, **kwargs))
+        finally:
+            self.api.metrics.record_refresh(self.name, time.perf_counter() - started, self.last_update_success)
+            self.api.profiler.record_poll()
+
+    @property
+    def last_push(self):
+        return max(self.pushes.values(), default=None)
+
+    @property
+    def stale(self):
+        return self.stale_since is not None
+
+    def _serve_stale(self, err, message):
+        """Keep serving the last snapshot through a short outage, otherwise raise UpdateFailed.
+
+        Entities stay available with a stale_since attribute instead of all
+        flapping to unavailable while the cloud (or the circuit breaker) is down.
+        """
+        now = dt_util.utcnow()
+        if self.data is None or (self.stale_since is not None and now - self.stale_since > STALE_MAX_AGE):
+            raise UpdateFailed(f"{message}: {err}") from err
+        if self.stale_since is None:
+            self.stale_since = now
+            _LOGGER.warning("%s, serving last known data: %s", message, err)
+        else:
+            _LOGGER.debug("%s, still serving data from %s", message, self.stale_since)
+        self.changes = {}
+        return self.data
+
+    def restore_snapshot(self):
+        """Seed data from the warm-start cache. Returns True if a snapshot was found."""
+        if self.cache is None:
+            return False
+        snapshot = self.cache.get_snapshot(self.cache_key)
+        if snapshot is None:
+            return False
+        try:
+            self.data = parse_devices(snapshot, self.model)
+        except ValueError as err:
+            _LOGGER.warning("Ignoring unreadable %s snapshot: %s", self.name, err)
+            return False
+        # Stale since the last poll that confirmed it, so an old cache is not served for long
+        self.stale_since = self.cache.get_snapshot_time(self.cache_key) or dt_util.utcnow()
+        return True
+
+    @callback
+    def async_start_tracking(self):
+        """Remember the current devices and keep polling even without entities.
+
+        Without entities the coordinator has no listeners and would stop
+        polling after the first refresh, so devices added to the account later
+        would never show up. A no-op listener keeps the (slow) discovery polls
+        going, and a new device triggers a reload so its entities get created.
+        """
+        self.known_devices = set(self.data or {})
+        if not self.known_devices:
+            self.entry.async_on_unload(self.async_add_listener(lambda: None))
+
+    def _process_devices(self, data):
+        """Post-process freshly parsed {id: device} data from the API."""
+        self._empty_polls = 0 if data else self._empty_polls + 1
+        if self.known_devices is not None and data.keys() - self.known_devices:
+            _LOGGER.info("%s found new devices, reloading to add their entities", self.name)
+            self.known_devices |= data.keys()
+            self.hass.config_entries.async_schedule_reload(self.entry.entry_id)
+        self.changes = diff_snapshots(self.data, data)
+        self.stale_since = None
+        self._async_cache_snapshot(data)
+        self._async_adapt_interval(data)
+        return data
+
+    def _async_cache_snapshot(self, data):
+        """Save the snapshot for warm starts, only when it changed or was never saved."""
+        if self.cache is None:
+            return
+        if self.changes or self.cache.get_snapshot(self.cache_key) is None:
+            self.cache.async_update_snapshot(self.cache_key, [device.as_api() for device in data.values()])
+        else:
+            self.cache.mark_snapshot_current(self.cache_key)
+
+    def _device_activity(self, device, now):
+        """Return the activity level of one device. Subclasses add type specific signals."""
+        if device.connection_state == "Connected":
+            return ACTIVITY_NORMAL
+        last_activity = parse_timestamp(device.last_activity_time)
+        if last_activity is not None and now - last_activity <= RECENT_TELEMETRY_WINDOW:
+            return ACTIVITY_NORMAL
+        return ACTIVITY_IDLE
+
+    def _compute_update_interval(self, data):
+        """Pick the poll interval from the most active device in the snapshot.
+
+        An endpoint that keeps returning no devices drops to the slow discovery cadence.
+        """
+        if not data and self._empty_polls >= EMPTY_POLLS_BEFORE_DISCOVERY:
+            return DISCOVERY_INTERVAL
+        now = dt_util.utcnow()
+        level = max((self._device_activity(device, now) for device in data.values()), default=ACTIVITY_NORMAL)
+        if level == ACTIVITY_ACTIVE:
+            return self.min_interval
+        if level == ACTIVITY_NORMAL:
+            return self.base_interval
+        return self.max_interval
+
+    def _all_pushing(self, data):
+        """Return True if every device in the snapshot pushed within WEBHOOK_ACTIVE_WINDOW."""
+        now = dt_util.utcnow()
+        for device_id in data:
+            pushed = self.pushes.get(device_id)
+            if pushed is None or now - pushed > WEBHOOK_ACTIVE_WINDOW:
+                return False
+        return bool(data)
+
+    def _async_adapt_interval(self, data):
+        interval = self._compute_update_interval(data)
+        if self._all_pushing(data):
+            # Pushes deliver the data, polling is only a consistency check
+            interval = max(interval, WEBHOOK_POLL_INTERVAL)
+        if interval != self.update_interval:
+            _LOGGER.debug("%s polling interval changed from %s to %s", self.name, self.update_interval, interval)
+            self.update_interval = interval
+
+    async def _async_fetch_device(self, device_id):
+        """Fetch and parse a single device, or None. Implemented by coordinators that accept commands."""
+        return None
+
+    @callback
+    def async_confirm(self, device_id, field, expected, previous):
+        """Confirm a command with short single-device refreshes instead of waiting for the next poll."""
+        if type(self)._async_fetch_device is BaseRaptCoordinator._async_fetch_device:
+            # No single-device endpoint, the next poll confirms it
+            return
+        key = (device_id, field)
+        running = self._confirmations.pop(key, None)
+        if running is not None:
+            running.cancel()
+        task = self.entry.async_create_background_task(
+            self.hass,
+            self._async_confirm(device_id, field, expected, previous),
+            f"{self.name} confirm {field} on {device_id}",
+        )
+        self._confirmations[key] = task
+
+        def _discard(_):
+            if self._confirmations.get(key) is task:
+                del self._confirmations[key]
+
+        task.add_done_callback(_discard)
+
+    async def _async_confirm(self, device_id, field, expected, previous):
+        reported = None
+        for delay in CONFIRM_DELAYS:
+            await asyncio.sleep(delay)
+            try:
+                reported = await self._async_fetch_device(device_id)
+            except Exception as err:
+                _LOGGER.debug("Confirmation refresh of %s failed: %s", device_id, err)
+                continue
+            if reported and values_match(getattr(reported, field), expected):
+                self._async_merge_device(device_id, reported)
+                return
+
+        _LOGGER.warning(
+            "%s did not confirm %s=%s, rolling back the optimistic value", device_id, field, expected
+        )
+        if reported:
+            self._async_merge_device(device_id, reported)
+            return
+        device = (self.data or {}).get(device_id)
+        if device is not None and getattr(device, field) == expected:
+            setattr(device, field, previous)
+            self.changes = {device_id: frozenset((field,))}
+            self.async_update_listeners()
+
+    @callback
+    def _async_merge_device(self, device_id, device):
+        """Replace one device in the snapshot and notify listeners of what changed.
+
+        Unlike async_set_updated_data this leaves the refresh timer alone, so
+        pushes and confirmations never hold back the next poll of other devices.
+        """
+        if self.data is None or device_id not in self.data:
+            return
+        data = dict(self.data)
+        data[device_id] = device
+        self.changes = diff_snapshots(self.data, data)
+        self._async_cache_snapshot(data)
+        self.data = data
+        self._async_adapt_interval(data)
+        self.async_update_listeners()
+
+    @callback
+    def async_merge_push(self, device_id, api_fields):
+        """Merge API-named fields pushed through the webhook into one device.
+
+        Returns False for unknown devices.
+        """
+        if not self.data or device_id not in self.data:
+            return False
+        self.pushes[device_id] = dt_util.utcnow()
+        self._async_merge_device(device_id, self.data[device_id].with_api_fields(api_fields))
+        return True
+
+    async def async_shutdown(self):
+        """Cancel queued commands and confirmations along with the refresh timer."""
+        self.commands.async_cancel()
+        for task in list(self._confirmations.values()):
+            task.cancel()
+        await super().async_shutdown()
+
+    @callback
+    def async_add_delta_listener(self, update_callback):
+        """Listen for per-device field changes. The callback gets {device_id: frozenset(fields)}."""
+        self._delta_listeners.append(update_callback)
+
+        @callback
+        def remove_listener():
+            self._delta_listeners.remove(update_callback)
+
+        return remove_listener
+
+    @callback
+    def async_set_updated_data(self, data):
+        """Manually update data, computing the delta against the current snapshot."""
+        self.changes = diff_snapshots(self.data, data)
+        self._async_cache_snapshot(data)
+        self._async_adapt_interval(data)
+        super().async_set_updated_data(data)
 
-    async def _get_token_and_api(self, api_class):
-        """Handles token refresh and (re)instantiates the API class."""
-        token = await self.token_manager.get_token()
+    @callback
+    def _async_observe(self, device_id, device, changed):
+        """Analyse one changed device before entities are notified. device is None if it was removed.
 
-        if not self.api or self.api.token != token:
-            self.api = api_class(self.hass, token, self.entry)
+        Records the reading in the telemetry history and downsampled statistics;
+        subclasses extend this.
+        """
+        if self.history is None and self.downsampler is None:
+            return
+        if device is None:
+            if self.history is not None:
+                self.history.async_forget(device_id)
+            if self.downsampler is not None:
+                self.downsampler.forget(device_id)
+            return
+        fields = device.HISTORY_FIELDS
+        if "last_activity_time" not in changed and changed.isdisjoint(fields):
+            return
+        timestamp = (parse_timestamp(device.last_activity_time) or dt_util.utcnow()).timestamp()
+        if self.history is not None:
+            self.history.async_append(device_id, fields, timestamp, tuple(getattr(device, field) for field in fields))
+        if self.downsampler is not None:
+            self.downsampler.async_add(device, fields, timestamp)
 
-        return self.api
+    @callback
+    def async_update_listeners(self):
+        """Run per-device analysis, notify entities, then delta listeners, and clear the dispatched delta."""
+        data = self.data or {}
+        for device_id, changed in self.changes.items():
+            self._async_observe(device_id, data.get(device_id), changed)
+        super().async_update_listeners()
+        if self.changes:
+            for update_callback in list(self._delta_listeners):
+                update_callback(self.changes)
+        self.changes = {}
@@ -1,16 +1,28 @@
-from .base_coordinator import BaseRaptCoordinator
-from ..api.brewzilla_api import BrewZillaAPI
-from homeassistant.helpers.update_coordinator import UpdateFailed
+from .base_coordinator import ACTIVITY_ACTIVE, BaseRaptCoordinator
+from ..api.models import BrewZilla
 
 
 class BrewZillaDataUpdateCoordinator(BaseRaptCoordinator):
-    def __init__(self, hass, token_manager, update_interval, entry):
-        super().__init__(hass, token_manager, update_interval, entry, name="BrewZilla API")
+    cache_key = "brewzilla"
+    model = BrewZilla
+
+    def __init__(self, hass, client, update_interval, entry, cache=None, history=None, downsampler=None):
+        super().__init__(
+            hass, client, update_interval, entry, name="BrewZilla API", cache=cache, history=history, downsampler=downsampler
+        )
+
+    def _device_activity(self, device, now):
+        """A BrewZilla with the heater or pump running is mid-brew and polled fastest."""
+        if device.heating_enabled or device.pump_enabled:
+            return ACTIVITY_ACTIVE
+        return super()._device_activity(device, now)
 
     async def _async_update_data(self):
         try:
-            api = await self._get_token_and_api(BrewZillaAPI)
-            devices = await api.get_brewzillas()
-            return {device["id"]: device for device in devices if "id" in device}
+            devices = await self.api.get_brewzillas()
+            return self._process_devices(devices)
         except Exception as err:
-            raise UpdateFailed(f"Failed to fetch BrewZilla data: {err}") from err
+            return self._serve_stale(err, "Failed to fetch BrewZilla data")
+
+    async def _async_fetch_device(self, device_id):
+        return await self.api.get_brewzilla(device_id)
@@ -1,16 +1,109 @@
-from .base_coordinator import BaseRaptCoordinator
-from ..api.hydrometer_api import HydrometerAPI
-from homeassistant.helpers.update_coordinator import UpdateFailed
+from datetime import timedelta
+
+from .base_coordinator import BaseRaptCoordinator, parse_timestamp
+from ..analytics import FermentationAnalytics
+from ..anomaly import AnomalyDetector
+from ..api.models import Hydrometer, normalize_gravity
+from ..const import PILL_MIN_REPORT_PERIOD, PILL_REPORT_GRACE
+from homeassistant.core import callback
+from homeassistant.util import dt as dt_util
+
+
+class _ReportModel:
+    """Learned reporting period and phase of one Pill."""
+
+    __slots__ = ("last_report", "period")
+
+    def __init__(self, last_report):
+        self.last_report = last_report
+        self.period = None
+
+    def observe(self, report):
+        """Feed the latest report timestamp, updating the period estimate."""
+        if report <= self.last_report:
+            return
+        delta = (report - self.last_report).total_seconds()
+        self.last_report = report
+        if delta < PILL_MIN_REPORT_PERIOD:
+            return
+        if self.period is None:
+            self.period = delta
+            return
+        # Reports missed between two polls show up as a multiple of the period
+        cycles = max(1, round(delta / self.period))
+        self.period += (delta / cycles - self.period) * 0.3
+
+    def next_report(self, now):
+        """Return the next expected report time after now."""
+        period = timedelta(seconds=self.period)
+        expected = self.last_report + period
+        overdue = now - expected
+        if overdue > timedelta(0):
+            if overdue < period / 4:
+                # Running a little late, check again shortly rather than skip a cycle
+                return now + PILL_REPORT_GRACE
+            expected += period * (overdue // period + 1)
+        return expected
 
 
 class HydrometerDataUpdateCoordinator(BaseRaptCoordinator):
-    def __init__(self, hass, token_manager, update_interval, entry):
-        super().__init__(hass, token_manager, update_interval, entry, name="Hydrometer API")
+    cache_key = "hydrometer"
+    model = Hydrometer
+
+    def __init__(self, hass, client, update_interval, entry, cache=None, history=None, downsampler=None):
+        super().__init__(
+            hass, client, update_interval, entry, name="Hydrometer API", cache=cache, history=history, downsampler=downsampler
+        )
+        self._report_models = {}
+        self.analytics = FermentationAnalytics(cache)
+        self.anomalies = AnomalyDetector(hass, entry)
 
     async def _async_update_data(self):
         try:
-            api = await self._get_token_and_api(HydrometerAPI)
-            devices = await api.get_hydrometers()
-            return {device["id"]: device for device in devices if "id" in device}
+            devices = await self.api.get_hydrometers()
+            return self._process_devices(devices)
         except Exception as err:
-            raise UpdateFailed(f"Failed to fetch Hydrometer data: {err}") from err
+            return self._serve_stale(err, "Failed to fetch Hydrometer data")
+
+    @callback
+    def _async_observe(self, device_id, device, changed):
+        """Feed new readings to the fermentation analytics and anomaly detection before entities read them."""
+        super()._async_observe(device_id, device, changed)
+        if device is None:
+            self.analytics.forget(device_id)
+            self.anomalies.forget(device_id)
+            return
+        if "gravity" not in changed and "last_activity_time" not in changed and "temperature" not in changed:
+            return
+        gravity = normalize_gravity(device.gravity)
+        if gravity is not None:
+            self.analytics.observe(device_id, parse_timestamp(device.last_activity_time) or dt_util.utcnow(), gravity)
+        self.anomalies.observe_pill(device, self.analytics.get(device_id))
+
+    def _learn_report_cadence(self, data):
+        for device_id in self._report_models.keys() - data.keys():
+            del self._report_models[device_id]
+        for device_id, device in data.items():
+            report = parse_timestamp(device.last_activity_time)
+            if report is None:
+                continue
+            model = self._report_models.get(device_id)
+            if model is None:
+                self._report_models[device_id] = _ReportModel(report)
+            else:
+                model.observe(report)
+
+    def _compute_update_interval(self, data):
+        """Poll just after the next report expected from any Pill.
+
+        Pills push telemetry on a fixed interval, so once a Pill's period and
+        phase are known there is no point polling before its next report.
+        Falls back to the adaptive interval until a period has been learned.
+        """
+        self._learn_report_cadence(data)
+        now = dt_util.utcnow()
+        expected = [model.next_report(now) for model in self._report_models.values() if model.period]
+        if not expected:
+            return super()._compute_update_interval(data)
+        interval = min(expected) - now + PILL_REPORT_GRACE
+        return min(max(interval, self.min_interval), self.max_interval)
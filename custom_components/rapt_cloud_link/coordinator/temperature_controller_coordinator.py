@@ -1,16 +1,36 @@
-from .base_coordinator import BaseRaptCoordinator
-from ..api.temperatureController_api import TemperatureControllerAPI
-from homeassistant.helpers.update_coordinator import UpdateFailed
+from .base_coordinator import BaseRaptCoordinator, parse_timestamp
+from ..anomaly import AnomalyDetector
+from ..api.models import TemperatureController
+from homeassistant.core import callback
+from homeassistant.util import dt as dt_util
 
 
 class TemperatureControllerDataUpdateCoordinator(BaseRaptCoordinator):
-    def __init__(self, hass, token_manager, update_interval, entry):
-        super().__init__(hass, token_manager, update_interval, entry, name="Temperature Controller API")
+    cache_key = "temperature_controller"
+    model = TemperatureController
+
+    def __init__(self, hass, client, update_interval, entry, cache=None, history=None, downsampler=None):
+        super().__init__(
+            hass, client, update_interval, entry, name="Temperature Controller API", cache=cache, history=history, downsampler=downsampler
+        )
+        self.anomalies = AnomalyDetector(hass, entry)
 
     async def _async_update_data(self):
         try:
-            api = await self._get_token_and_api(TemperatureControllerAPI)
-            devices = await api.get_temperatureControllers()
-            return {device["id"]: device for device in devices if "id" in device}
+            devices = await self.api.get_temperature_controllers()
+            return self._process_devices(devices)
         except Exception as err:
-            raise UpdateFailed(f"Failed to fetch Temperatur Controller data: {err}") from err
+            return self._serve_stale(err, "Failed to fetch Temperatur Controller data")
+
+    @callback
+    def _async_observe(self, device_id, device, changed):
+        """Check new readings for a temperature excursion before entities read them."""
+        super()._async_observe(device_id, device, changed)
+        if device is None:
+            self.anomalies.forget(device_id)
+            return
+        if "temperature" in changed or "target_temperature" in changed:
+            self.anomalies.observe_controller(device, parse_timestamp(device.last_activity_time) or dt_util.utcnow())
+
+    async def _async_fetch_device(self, device_id):
+        return await self.api.get_temperature_controller(device_id)
@@ -0,0 +1,39 @@
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.const import CONF_WEBHOOK_ID
+
+from .const import DOMAIN
+
+TO_REDACT = {"email", "api_token", CONF_WEBHOOK_ID}
+
+COORDINATORS = (
+    "brewzilla_coordinator",
+    "hydrometer_coordinator",
+    "temperature_controller_coordinator",
+)
+
+
+async def async_get_config_entry_diagnostics(hass, entry):
+    """Return request metrics and coordinator state for a config entry."""
+    entry_data = hass.data[DOMAIN][entry.entry_id]
+    client = entry_data["client"]
+    token_manager = entry_data["token_manager"]
+
+    coordinators = {}
+    for key in COORDINATORS:
+        coordinator = entry_data[key]
+        coordinators[key] = {
+            "devices": len(coordinator.data or {}),
+            "update_interval_s": coordinator.update_interval.total_seconds() if coordinator.update_interval else None,
+            "last_update_success": coordinator.last_update_success,
+            "stale_since": coordinator.stale_since.isoformat() if coordinator.stale_since else None,
+            "last_push": coordinator.last_push.isoformat() if coordinator.last_push else None,
+        }
+
+    return {
+        "entry": async_redact_data(dict(entry.data), TO_REDACT),
+        "metrics": entry_data["metrics"].as_dict(),
+        "coordinators": coordinators,
+        "circuit_breaker": {"state": client.breaker.state, "failures": client.breaker.failures},
+        "rate_limit_blocked_for_s": round(client.scheduler.blocked_for, 1),
+        "token_expiry": token_manager.token_expiry.isoformat() if token_manager.token_expiry else None,
+    }
@@ -0,0 +1,197 @@
+import base64
+import logging
+import math
+import sys
+from array import array
+from datetime import datetime, timezone
+
+from homeassistant.core import callback
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN, HISTORY_CAPACITY, HISTORY_SAVE_DELAY
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+
+
+def _encode(values):
+    if sys.byteorder == "big":
+        values = array(values.typecode, values)
+        values.byteswap()
+    return base64.b64encode(values.tobytes()).decode("ascii")
+
+
+def _decode(typecode, text, capacity):
+    values = array(typecode)
+    values.frombytes(base64.b64decode(text))
+    if sys.byteorder == "big":
+        values.byteswap()
+    if len(values) != capacity:
+        raise ValueError(f"expected {capacity} values, got {len(values)}")
+    return values
+
+
+class RingBuffer:
+    """Fixed-size history of timestamped samples for one device.
+
+    Timestamps are kept as uint32 epoch seconds and each field in its own
+    float32 array, with NaN for missing values, so a full buffer of
+    HISTORY_CAPACITY samples takes a few kilobytes per field.
+    """
+
+    __slots__ = ("capacity", "fields", "_times", "_values", "_next", "_count")
+
+    def __init__(self, fields, capacity=HISTORY_CAPACITY):
+        self.capacity = capacity
+        self.fields = tuple(fields)
+        self._times = array("I", bytes(4 * capacity))
+        self._values = [array("f", [math.nan]) * capacity for _ in self.fields]
+        self._next = 0
+        self._count = 0
+
+    def __len__(self):
+        return self._count
+
+    @property
+    def last_time(self):
+        if not self._count:
+            return None
+        return self._times[(self._next - 1) % self.capacity]
+
+    def append(self, timestamp, values):
+        """Add a sample, values being a tuple ordered like fields (None for missing)."""
+        index = self._next
+        self._times[index] = int(timestamp)
+        for column, value in zip(self._values, values):
+            column[index] = math.nan if value is None else value
+        self._next = (index + 1) % self.capacity
+        self._count = min(self._count + 1, self.capacity)
+
+    def samples(self, since=None):
+        """Return samples oldest first as dicts, optionally only those at or after since (epoch seconds)."""
+        start = (self._next - self._count) % self.capacity
+        result = []
+        for offset in range(self._count):
+            index = (start + offset) % self.capacity
+            timestamp = self._times[index]
+            if since is not None and timestamp < since:
+                continue
+            sample = {"time": datetime.fromtimestamp(timestamp, timezone.utc).isoformat()}
+            for field, column in zip(self.fields, self._values):
+                value = column[index]
+                sample[field] = None if math.isnan(value) else round(value, 4)
+            result.append(sample)
+        return result
+
+    def as_dict(self):
+        return {
+            "fields": list(self.fields),
+            "next": self._next,
+            "count": self._count,
+            "times": _encode(self._times),
+            "values": [_encode(column) for column in self._values],
+        }
+
+    @classmethod
+    def from_dict(cls, data, fields):
+        """Restore a saved buffer. Raises ValueError if it does not match fields and capacity."""
+        if data["fields"] != list(fields):
+            raise ValueError("fields changed")
+        buffer = cls(fields)
+        buffer._times = _decode("I", data["times"], buffer.capacity)
+        buffer._values = [_decode("f", text, buffer.capacity) for text in data["values"]]
+        buffer._next = int(data["next"]) % buffer.capacity
+        buffer._count = min(int(data["count"]), buffer.capacity)
+        return buffer
+
+
+class TelemetryHistory:
+    """Per-device ring buffers for one config entry, persisted through Store.
+
+    Coordinators append to it as readings arrive. Saving is delayed by
+    HISTORY_SAVE_DELAY and only re-encodes the buffers that changed since the
+    last save.
+    """
+
+    def __init__(self, hass, entry):
+        self.hass = hass
+        self._store = Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}.history")
+        self._buffers = {}
+        self._saved = {}
+        self._stored = {}
+        self._dirty = set()
+
+    async def async_load(self):
+        """Load saved buffers. They are restored lazily, once a device's fields are known."""
+        try:
+            stored = await self._store.async_load()
+        except Exception as err:
+            _LOGGER.warning("Could not load RAPT history, starting empty: %s", err)
+            stored = None
+        if isinstance(stored, dict):
+            self._stored = stored
+
+    def get(self, device_id, since=None):
+        """Return the samples of a device oldest first, see RingBuffer.samples."""
+        buffer = self._buffers.get(device_id)
+        if buffer is None:
+            # Not reported since startup, restore it with the fields it was saved with
+            fields = (self._stored.get(device_id) or {}).get("fields")
+            if not isinstance(fields, list):
+                return []
+            buffer = self._buffers[device_id] = self._restore(device_id, fields)
+        return buffer.samples(since)
+
+    @callback
+    def async_append(self, device_id, fields, timestamp, values):
+        """Add a reading unless it is not newer than the last one stored."""
+        buffer = self._buffers.get(device_id)
+        if buffer is None:
+            buffer = self._buffers[device_id] = self._restore(device_id, fields)
+        elif buffer.fields != tuple(fields):
+            # Restored by get() with fields the model no longer has
+            buffer = self._buffers[device_id] = RingBuffer(fields)
+        last = buffer.last_time
+        if last is not None and int(timestamp) <= last:
+            return
+        buffer.append(timestamp, values)
+        self._dirty.add(device_id)
+        self._store.async_delay_save(self._data_to_save, HISTORY_SAVE_DELAY)
+
+    @callback
+    def async_forget(self, device_id):
+        """Drop the history of a device that left the account."""
+        removed = [stored.pop(device_id, None) for stored in (self._buffers, self._saved, self._stored)]
+        self._dirty.discard(device_id)
+        if any(item is not None for item in removed):
+            self._store.async_delay_save(self._data_to_save, HISTORY_SAVE_DELAY)
+
+    def _restore(self, device_id, fields):
+        data = self._stored.pop(device_id, None)
+        if data is not None:
+            try:
+                buffer = RingBuffer.from_dict(data, fields)
+            except (KeyError, TypeError, ValueError) as err:
+                _LOGGER.debug("Dropping saved history of %s: %s", device_id, err)
+            else:
+                self._saved[device_id] = data
+                return buffer
+        return RingBuffer(fields)
+
+    @callback
+    def _data_to_save(self):
+        for device_id in self._dirty:
+            buffer = self._buffers.get(device_id)
+            if buffer is not None:
+                self._saved[device_id] = buffer.as_dict()
+        self._dirty.clear()
+        # Saved buffers of devices not seen since startup are kept as they were
+        return {**self._stored, **self._saved}
+
+    async def async_flush(self):
+        """Write pending changes now instead of after HISTORY_SAVE_DELAY."""
+        await self._store.async_save(self._data_to_save())
+
+    async def async_remove(self):
+        await self._store.async_remove()
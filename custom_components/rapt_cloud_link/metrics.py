@@ -0,0 +1,163 @@
+import time
+
+# Upper bounds (seconds) of the latency histogram buckets, the last bucket is open ended
+LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class _EndpointMetrics:
+    __slots__ = (
+        "requests",
+        "errors",
+        "bytes",
+        "latency_sum",
+        "latency_max",
+        "histogram",
+        "decode_count",
+        "decode_sum",
+        "decode_max",
+    )
+
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.bytes = 0
+        self.latency_sum = 0.0
+        self.latency_max = 0.0
+        self.histogram = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.decode_count = 0
+        self.decode_sum = 0.0
+        self.decode_max = 0.0
+
+    def as_dict(self):
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "bytes_received": self.bytes,
+            "latency_avg_ms": round(self.latency_sum / self.requests * 1000, 1) if self.requests else None,
+            "latency_max_ms": round(self.latency_max * 1000, 1),
+            "latency_histogram": {
+                **{f"le_{bound}": count for bound, count in zip(LATENCY_BUCKETS, self.histogram)},
+                "inf": self.histogram[-1],
+            },
+            "decode_avg_ms": round(self.decode_sum / self.decode_count * 1000, 2) if self.decode_count else None,
+            "decode_max_ms": round(self.decode_max * 1000, 2),
+        }
+
+
+class _RefreshMetrics:
+    __slots__ = ("count", "failures", "duration_sum", "duration_max", "last_duration")
+
+    def __init__(self):
+        self.count = 0
+        self.failures = 0
+        self.duration_sum = 0.0
+        self.duration_max = 0.0
+        self.last_duration = None
+
+    def as_dict(self):
+        return {
+            "refreshes": self.count,
+            "failures": self.failures,
+            "duration_avg_ms": round(self.duration_sum / self.count * 1000, 1) if self.count else None,
+            "duration_max_ms": round(self.duration_max * 1000, 1),
+            "duration_last_ms": round(self.last_duration * 1000, 1) if self.last_duration is not None else None,
+        }
+
+
+class RaptMetrics:
+    """Performance counters for one config entry.
+
+    Fed by the shared request path in RaptCloudClient, by TokenManager and by
+    the coordinators, and read by the diagnostic sensors and diagnostics.py.
+    Listeners are called after every coordinator refresh.
+    """
+
+    def __init__(self):
+        self.started = time.time()
+        self.endpoints = {}
+        self.refreshes = {}
+        self.token_refreshes = 0
+        self.token_failures = 0
+        self._listeners = []
+
+    def add_listener(self, update_callback):
+        """Call update_callback after every coordinator refresh. Returns a function that removes it."""
+        self._listeners.append(update_callback)
+        return lambda: self._listeners.remove(update_callback)
+
+    def _endpoint(self, endpoint):
+        metrics = self.endpoints.get(endpoint)
+        if metrics is None:
+            metrics = self.endpoints[endpoint] = _EndpointMetrics()
+        return metrics
+
+    def record_request(self, endpoint, latency, nbytes=0, error=False):
+        metrics = self._endpoint(endpoint)
+        metrics.requests += 1
+        metrics.bytes += nbytes
+        metrics.latency_sum += latency
+        metrics.latency_max = max(metrics.latency_max, latency)
+        for index, bound in enumerate(LATENCY_BUCKETS):
+            if latency <= bound:
+                break
+        else:
+            index = len(LATENCY_BUCKETS)
+        metrics.histogram[index] += 1
+        if error:
+            metrics.errors += 1
+
+    def record_decode(self, endpoint, duration):
+        metrics = self._endpoint(endpoint)
+        metrics.decode_count += 1
+        metrics.decode_sum += duration
+        metrics.decode_max = max(metrics.decode_max, duration)
+
+    def record_token_refresh(self, success):
+        if success:
+            self.token_refreshes += 1
+        else:
+            self.token_failures += 1
+
+    def record_refresh(self, name, duration, success):
+        metrics = self.refreshes.get(name)
+        if metrics is None:
+            metrics = self.refreshes[name] = _RefreshMetrics()
+        metrics.count += 1
+        metrics.duration_sum += duration
+        metrics.duration_max = max(metrics.duration_max, duration)
+        metrics.last_duration = duration
+        if not success:
+            metrics.failures += 1
+        for update_callback in list(self._listeners):
+            update_callback()
+
+    @property
+    def total_requests(self):
+        return sum(metrics.requests for metrics in self.endpoints.values())
+
+    @property
+    def total_errors(self):
+        return sum(metrics.errors for metrics in self.endpoints.values())
+
+    @property
+    def total_bytes(self):
+        return sum(metrics.bytes for metrics in self.endpoints.values())
+
+    @property
+    def average_latency_ms(self):
+        requests = self.total_requests
+        if not requests:
+            return None
+        return round(sum(metrics.latency_sum for metrics in self.endpoints.values()) / requests * 1000, 1)
+
+    def as_dict(self):
+        return {
+            "uptime_s": round(time.time() - self.started),
+            "requests": self.total_requests,
+            "errors": self.total_errors,
+            "bytes_received": self.total_bytes,
+            "token_refreshes": self.token_refreshes,
+            "token_failures": self.token_failures,
+            "endpoints": {endpoint: metrics.as_dict() for endpoint, metrics in self.endpoints.items()},
+            "coordinators": {name: metrics.as_dict() for name, metrics in self.refreshes.items()},
+        }
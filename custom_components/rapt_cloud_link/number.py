@@ -2,6 +2,14 @@ from .const import CONF_TEMPERATURE_UNIT, DEFAULT_TEMPERATURE_UNIT,DOMAIN
 from .base import BaseRaptNumber
 
 
+def _api_temperature(coordinator, value):
+    """Convert a target entered in the configured unit to the Celsius the API and the models use."""
+    unit = coordinator.config_entry.data.get(CONF_TEMPERATURE_UNIT, DEFAULT_TEMPERATURE_UNIT)
+    if unit == "F":
+        value = (value - 32) * 5 / 9
+    return round(float(value), 2)
+
+
 async def async_setup_entry(hass, entry, async_add_entities):
     brewzilla_coordinator = hass.data[DOMAIN][entry.entry_id]["brewzilla_coordinator"]
     temperature_controller_coordinator = hass.data[DOMAIN][entry.entry_id]["temperature_controller_coordinator"]
@@ -20,7 +28,7 @@ async def async_setup_entry(hass, entry, async_add_entities):
 
     # Add sensors if any
     if numbers:
-        async_add_entities(numbers, update_before_add=True)
+        async_add_entities(numbers, update_before_add=False)
 
 
 # class BaseBrewZillaNumber(NumberEntity):
@@ -57,6 +65,8 @@ async def async_setup_entry(hass, entry, async_add_entities):
 
 
 class BrewZillaHeatUtilization(BaseRaptNumber):
+    _source_fields = ("heating_utilisation",)
+
     def __init__(self, coordinator, device_id):
         super().__init__(
             coordinator, device_id,
@@ -71,16 +81,17 @@ class BrewZillaHeatUtilization(BaseRaptNumber):
 
     @property
     def native_value(self):
-        return self.coordinator.data.get(self._device_id, {}).get("heatingUtilisation", 0)
+        return self._device_value("heating_utilisation", 0)
 
     async def async_set_native_value(self, value: float):
-        success = await self.coordinator.api.set_heating_utilization(self._device_id, int(value))
-        if success and self._device_id in self.coordinator.data:
-            self.coordinator.data[self._device_id]["heatingUtilisation"] = int(value)
-            self.async_write_ha_state()
+        success = await self.coordinator.commands.async_send(self._device_id, "set_heating_utilization", int(value))
+        if success:
+            self._async_apply_optimistic("heating_utilisation", int(value))
 
 
 class BrewZillaPumpUtilization(BaseRaptNumber):
+    _source_fields = ("pump_utilisation",)
+
     def __init__(self, coordinator, device_id):
         super().__init__(
             coordinator, device_id,
@@ -95,16 +106,17 @@ class BrewZillaPumpUtilization(BaseRaptNumber):
 
     @property
     def native_value(self):
-        return self.coordinator.data.get(self._device_id, {}).get("pumpUtilisation", 0)
+        return self._device_value("pump_utilisation", 0)
 
     async def async_set_native_value(self, value: float):
-        success = await self.coordinator.api.set_pump_utilization(self._device_id, int(value))
-        if success and self._device_id in self.coordinator.data:
-            self.coordinator.data[self._device_id]["pumpUtilisation"] = int(value)
-            self.async_write_ha_state()
+        success = await self.coordinator.commands.async_send(self._device_id, "set_pump_utilization", int(value))
+        if success:
+            self._async_apply_optimistic("pump_utilisation", int(value))
 
 
 class BrewZillaTargetTemperature(BaseRaptNumber):
+    _source_fields = ("target_temperature",)
+
     def __init__(self, coordinator, device_id):
         super().__init__(
             coordinator, device_id,
@@ -125,7 +137,7 @@ class BrewZillaTargetTemperature(BaseRaptNumber):
     @property
     def native_value(self):
         unit = self.coordinator.config_entry.data.get(CONF_TEMPERATURE_UNIT, DEFAULT_TEMPERATURE_UNIT)
-        value = self.coordinator.data.get(self._device_id, {}).get("targetTemperature", 20.0)
+        value = self._device_value("target_temperature", 20.0)
 
         if(unit == "F"):
             value = (value * 9/5) + 32
@@ -133,10 +145,10 @@ class BrewZillaTargetTemperature(BaseRaptNumber):
         return round(value, 1)
 
     async def async_set_native_value(self, value: float):
-        success = await self.coordinator.api.set_target_temperature(self._device_id, float(value))
-        if success and self._device_id in self.coordinator.data:
-            self.coordinator.data[self._device_id]["targetTemperature"] = float(value)
-            self.async_write_ha_state()
+        value = _api_temperature(self.coordinator, value)
+        success = await self.coordinator.commands.async_send(self._device_id, "set_brewzilla_target_temperature", value)
+        if success:
+            self._async_apply_optimistic("target_temperature", value)
 
 
 # ---------------------
@@ -176,6 +188,8 @@ class BrewZillaTargetTemperature(BaseRaptNumber):
 
 
 class TemperatureControllerTargetTemperature(BaseRaptNumber):
+    _source_fields = ("target_temperature",)
+
     def __init__(self, coordinator, device_id):
         super().__init__(
             coordinator, device_id,
@@ -196,7 +210,7 @@ class TemperatureControllerTargetTemperature(BaseRaptNumber):
     @property
     def native_value(self):
         unit = self.coordinator.config_entry.data.get(CONF_TEMPERATURE_UNIT, DEFAULT_TEMPERATURE_UNIT)
-        value = self.coordinator.data.get(self._device_id, {}).get("targetTemperature", 20.0)
+        value = self._device_value("target_temperature", 20.0)
 
         if(unit == "F"):
             value = (value * 9/5) + 32
@@ -204,7 +218,7 @@ class TemperatureControllerTargetTemperature(BaseRaptNumber):
         return round(value, 1)
 
     async def async_set_native_value(self, value: float):
-        success = await self.coordinator.api.set_target_temperature(self._device_id, float(value))
-        if success and self._device_id in self.coordinator.data:
-            self.coordinator.data[self._device_id]["targetTemperature"] = float(value)
-            self.async_write_ha_state()
\ No newline at end of file
+        value = _api_temperature(self.coordinator, value)
+        success = await self.coordinator.commands.async_send(self._device_id, "set_temperature_controller_target_temperature", value)
+        if success:
+            self._async_apply_optimistic("target_temperature", value)
\ No newline at end of file
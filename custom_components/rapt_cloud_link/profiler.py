@@ -0,0 +1,136 @@
+import asyncio
+import cProfile
+import logging
+
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN, PROFILE_MAX_DURATION
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class _ProfiledSteps:
+    """Drive a coroutine, profiling each of its steps and nothing in between.
+
+    Other integrations' callbacks that run while the coroutine is suspended
+    are not recorded.
+    """
+
+    __slots__ = ("_coro", "_profiler")
+
+    def __init__(self, coro, profiler):
+        self._coro = coro
+        self._profiler = profiler
+
+    def __await__(self):
+        send, value = self._coro.send, None
+        while True:
+            profile = self._profiler._step_started()
+            try:
+                yielded = send(value)
+            except StopIteration as stop:
+                return stop.value
+            finally:
+                self._profiler._step_finished(profile)
+            try:
+                value = yield yielded
+                send = self._coro.send
+            except GeneratorExit:
+                self._coro.close()
+                raise
+            except BaseException as err:  # noqa: BLE001 - forwarded into the coroutine
+                send, value = self._coro.throw, err
+
+
+class RaptProfiler:
+    """On-demand cProfile session limited to this integration's coroutines.
+
+    Coordinator refreshes, command executions, GET fetches and token refreshes
+    pass through wrap(). While no session runs wrap() returns the coroutine
+    untouched, so profiling costs nothing when it is off.
+    """
+
+    def __init__(self, hass):
+        self.hass = hass
+        self.profile = None
+        self._depth = 0
+        self._polls = 0
+        self._polls_target = None
+        self._done = None
+
+    @property
+    def running(self):
+        return self.profile is not None
+
+    def wrap(self, coro):
+        if self.profile is None:
+            return coro
+        return self._run(coro)
+
+    async def _run(self, coro):
+        return await _ProfiledSteps(coro, self)
+
+    def _step_started(self):
+        profile = self.profile
+        if profile is None:
+            return None
+        if self._depth == 0:
+            try:
+                profile.enable()
+            except ValueError:
+                # Another profiler (e.g. the profiler integration) owns the interpreter hook
+                return None
+        self._depth += 1
+        return profile
+
+    def _step_finished(self, profile):
+        if profile is None:
+            return
+        self._depth -= 1
+        if self._depth == 0:
+            profile.disable()
+
+    def record_poll(self):
+        """Count a finished coordinator refresh towards a poll-limited session."""
+        if self.profile is None or self._polls_target is None:
+            return
+        self._polls += 1
+        if self._polls >= self._polls_target:
+            self._done.set()
+
+    async def async_profile(self, duration=None, polls=None):
+        """Profile for duration seconds or polls coordinator refreshes and return the .prof path."""
+        if self.profile is not None:
+            raise HomeAssistantError("A RAPT Cloud Link profiling session is already running")
+        self.profile = cProfile.Profile()
+        self._depth = 0
+        self._polls = 0
+        self._polls_target = polls
+        self._done = asyncio.Event()
+        _LOGGER.info(
+            "Profiling RAPT Cloud Link for %s",
+            f"{polls} coordinator refreshes" if polls else f"{duration} s",
+        )
+        try:
+            await asyncio.wait_for(self._done.wait(), duration if duration else PROFILE_MAX_DURATION)
+        except asyncio.TimeoutError:
+            if polls:
+                _LOGGER.warning("Profiling stopped after %s of %s coordinator refreshes", self._polls, polls)
+        finally:
+            profile = self.profile
+            self.profile = None
+            self._polls_target = None
+
+        path = self.hass.config.path(f"{DOMAIN}_{dt_util.now().strftime('%Y%m%d_%H%M%S')}.prof")
+        await self.hass.async_add_executor_job(profile.dump_stats, path)
+        _LOGGER.info("RAPT Cloud Link profile written to %s (open with snakeviz or python -m pstats)", path)
+        return path
+
+
+def async_get_profiler(hass):
+    """Return the profiler shared by all config entries, creating it on first use."""
+    profiler = hass.data.get(f"{DOMAIN}_profiler")
+    if profiler is None:
+        profiler = hass.data[f"{DOMAIN}_profiler"] = RaptProfiler(hass)
+    return profiler
@@ -3,10 +3,23 @@ from homeassistant.core import HomeAssistant
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.components.sensor import (
     SensorDeviceClass,
+    SensorEntity,
     SensorStateClass,
 )
-from .const import CONF_TEMPERATURE_UNIT, DEFAULT_TEMPERATURE_UNIT, DOMAIN
+from homeassistant.const import EntityCategory, UnitOfInformation, UnitOfTime
+from homeassistant.helpers.device_registry import DeviceEntryType
+from .const import (
+    CONF_TEMPERATURE_UNIT,
+    DEFAULT_TEMPERATURE_UNIT,
+    DOMAIN,
+    DOWNSAMPLE_ABV_CHANGE,
+    DOWNSAMPLE_GRAVITY_CHANGE,
+    DOWNSAMPLE_PERCENT_CHANGE,
+    DOWNSAMPLE_TEMPERATURE_CHANGE,
+)
 from .base import BaseRaptSensor
+from .analytics import as_datetime
+from .api.models import normalize_gravity
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -19,28 +32,39 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_e
     sensors = []
 
     # BrewZilla
-    for device_id, device in brewzilla_coordinator.data.items():
-        name = device.get("name", f"BrewZilla {device_id}")
+    for device_id in brewzilla_coordinator.data:
         sensors.append(BrewZillaTemperatureSensor(brewzilla_coordinator, device_id))
         sensors.append(BrewZillaConnectionStateSensor(brewzilla_coordinator, device_id))
 
     # Hydrometer
-    for device_id, device in hydrometer_coordinator.data.items():
-        name = device.get("name", f"Pill {device_id}")
+    for device_id in hydrometer_coordinator.data:
         sensors.append(HydrometerTemperatureSensor(hydrometer_coordinator, device_id))
         sensors.append(HydrometerGravitySensor(hydrometer_coordinator, device_id))
         sensors.append(HydrometerBatterySensor(hydrometer_coordinator, device_id))
         sensors.append(HydrometerConnectionStateSensor(hydrometer_coordinator, device_id))
+        sensors.append(HydrometerOriginalGravitySensor(hydrometer_coordinator, device_id))
+        sensors.append(HydrometerGravitySlopeSensor(hydrometer_coordinator, device_id))
+        sensors.append(HydrometerABVSensor(hydrometer_coordinator, device_id))
+        sensors.append(HydrometerAttenuationSensor(hydrometer_coordinator, device_id))
+        sensors.append(HydrometerStableGravityETASensor(hydrometer_coordinator, device_id))
 
     # Temperature Controller
-    for device_id, device in temperature_controller_coordinator.data.items():
-        name = device.get("name", f"Temperature Controller {device_id}")
+    for device_id in temperature_controller_coordinator.data:
         sensors.append(TemperatureControllerTemperatureSensor(temperature_controller_coordinator, device_id))
 
+    # Diagnostics
+    metrics = hass.data[DOMAIN][entry.entry_id]["metrics"]
+    sensors.append(RaptRequestsSensor(entry, metrics))
+    sensors.append(RaptErrorsSensor(entry, metrics))
+    sensors.append(RaptLatencySensor(entry, metrics))
+    sensors.append(RaptBytesReceivedSensor(entry, metrics))
+    sensors.append(RaptTokenRefreshesSensor(entry, metrics))
+    for coordinator in (brewzilla_coordinator, hydrometer_coordinator, temperature_controller_coordinator):
+        sensors.append(RaptRefreshDurationSensor(entry, metrics, coordinator.name))
 
     # Add sensors if any
     if sensors:
-        async_add_entities(sensors, update_before_add=True)
+        async_add_entities(sensors, update_before_add=False)
 
 
 # ---------------------
@@ -48,6 +72,10 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_e
 # ---------------------
 class BrewZillaTemperatureSensor(BaseRaptSensor):
     """BrewZilla Temperature Sensor."""
+    _source_fields = ("temperature",)
+    _statistic_field = "temperature"
+    _significant_change = DOWNSAMPLE_TEMPERATURE_CHANGE
+
     def __init__(self, coordinator, device_id: str):
         super().__init__(
             coordinator,
@@ -66,13 +94,12 @@ class BrewZillaTemperatureSensor(BaseRaptSensor):
         return "°F" if unit == "F" else "°C"
     @property
     def native_value(self):
-        device = self.coordinator.data.get(self._device_id)
-        if device:
-            return device.get("temperature")
-        return None
+        return self._device_value("temperature")
     
 class BrewZillaConnectionStateSensor(BaseRaptSensor):
     """BrewZilla Connection State Sensor."""
+    _source_fields = ("connection_state",)
+
     def __init__(self, coordinator, device_id: str):
         super().__init__(
             coordinator,
@@ -87,10 +114,7 @@ class BrewZillaConnectionStateSensor(BaseRaptSensor):
     @property
     def native_value(self):
         """Return the current connection state."""
-        device = self.coordinator.data.get(self._device_id)
-        if device:
-            return device.get("connectionState", "Disconnected")
-        return "Disconnected"
+        return self._device_value("connection_state", "Disconnected")
     
 
 # ---------------------
@@ -98,6 +122,10 @@ class BrewZillaConnectionStateSensor(BaseRaptSensor):
 # ---------------------
 class HydrometerTemperatureSensor(BaseRaptSensor):
     """Hydrometer Temperature Sensor."""
+    _source_fields = ("temperature",)
+    _statistic_field = "temperature"
+    _significant_change = DOWNSAMPLE_TEMPERATURE_CHANGE
+
     def __init__(self, coordinator, device_id: str):
         super().__init__(
             coordinator,
@@ -116,13 +144,14 @@ class HydrometerTemperatureSensor(BaseRaptSensor):
         return "°F" if unit == "F" else "°C"
     @property
     def native_value(self):
-        device = self.coordinator.data.get(self._device_id)
-        if device:
-            return device.get("temperature")
-        return None
+        return self._device_value("temperature")
     
 class HydrometerGravitySensor(BaseRaptSensor):
     """Hydrometer Gravity Sensor."""
+    _source_fields = ("gravity",)
+    _statistic_field = "gravity"
+    _significant_change = DOWNSAMPLE_GRAVITY_CHANGE
+
     def __init__(self, coordinator, device_id: str):
         super().__init__(
             coordinator,
@@ -138,17 +167,15 @@ class HydrometerGravitySensor(BaseRaptSensor):
     @property
     def native_value(self):
         """Return the current gravity."""
-        device = self.coordinator.data.get(self._device_id)
-        if device:
-            sg = device.get("gravity")
-            while sg > 10:
-                sg /= 10
-            return round(sg, 3)
-        return None
+        return normalize_gravity(self._device_value("gravity"))
     
 
 class HydrometerBatterySensor(BaseRaptSensor):
     """Hydrometer Battery Sensor."""
+    _source_fields = ("battery",)
+    _statistic_field = "battery"
+    _significant_change = DOWNSAMPLE_PERCENT_CHANGE
+
     def __init__(self, coordinator, device_id: str):
         super().__init__(
             coordinator,
@@ -164,13 +191,15 @@ class HydrometerBatterySensor(BaseRaptSensor):
     @property
     def native_value(self):
         """Return the current battery."""
-        device = self.coordinator.data.get(self._device_id)
-        if device:
-            return round(device.get("battery"), 1)
-        return None
+        battery = self._device_value("battery")
+        if battery is None:
+            return None
+        return round(battery, 1)
     
 class HydrometerConnectionStateSensor(BaseRaptSensor):
     """Hydrometer Connection State Sensor."""
+    _source_fields = ("connection_state",)
+
     def __init__(self, coordinator, device_id: str):
         super().__init__(
             coordinator,
@@ -185,10 +214,121 @@ class HydrometerConnectionStateSensor(BaseRaptSensor):
     @property
     def native_value(self):
         """Return the current connection state."""
-        device = self.coordinator.data.get(self._device_id)
-        if device:
-            return device.get("connectionState", "Disconnected")
-        return "Disconnected"
+        return self._device_value("connection_state", "Disconnected")
+
+
+# ---------------------
+# Hydrometer fermentation analytics
+# ---------------------
+class HydrometerAnalyticsSensor(BaseRaptSensor):
+    """Base class for sensors derived from the Pill's fermentation analytics."""
+    _source_fields = ("gravity", "last_activity_time")
+
+    def __init__(self, coordinator, device_id: str, name_suffix, unique_suffix, unit=None):
+        super().__init__(
+            coordinator,
+            device_id,
+            model="Hydrometer",
+            name_suffix=name_suffix,
+            unique_suffix=unique_suffix,
+            unit=unit
+        )
+
+    def _fermentation(self):
+        return self.coordinator.analytics.get(self._device_id)
+
+
+class HydrometerOriginalGravitySensor(HydrometerAnalyticsSensor):
+    """Highest gravity since the Pill went into the current batch."""
+
+    def __init__(self, coordinator, device_id: str):
+        super().__init__(coordinator, device_id, "Original Gravity", "original_gravity", unit="SG")
+
+    @property
+    def native_value(self):
+        fermentation = self._fermentation()
+        if fermentation is None or fermentation.original_gravity is None:
+            return None
+        return round(fermentation.original_gravity, 3)
+
+    @property
+    def extra_state_attributes(self):
+        fermentation = self._fermentation()
+        attributes = dict(super().extra_state_attributes or {})
+        if fermentation is not None and fermentation.started is not None:
+            attributes["fermentation_started"] = as_datetime(fermentation.started).isoformat()
+        return attributes or None
+
+
+class HydrometerGravitySlopeSensor(HydrometerAnalyticsSensor):
+    """Least-squares gravity trend over the last day."""
+    _significant_change = DOWNSAMPLE_GRAVITY_CHANGE
+
+    def __init__(self, coordinator, device_id: str):
+        super().__init__(coordinator, device_id, "Gravity Slope", "gravity_slope", unit="SG/d")
+        self._attr_state_class = SensorStateClass.MEASUREMENT
+
+    @property
+    def native_value(self):
+        fermentation = self._fermentation()
+        if fermentation is None or fermentation.slope is None:
+            return None
+        return round(fermentation.slope, 4)
+
+
+class HydrometerABVSensor(HydrometerAnalyticsSensor):
+    """Estimated alcohol by volume."""
+    _significant_change = DOWNSAMPLE_ABV_CHANGE
+
+    def __init__(self, coordinator, device_id: str):
+        super().__init__(coordinator, device_id, "ABV", "abv", unit="%")
+        self._attr_state_class = SensorStateClass.MEASUREMENT
+
+    @property
+    def native_value(self):
+        fermentation = self._fermentation()
+        if fermentation is None or fermentation.abv is None:
+            return None
+        return round(fermentation.abv, 2)
+
+
+class HydrometerAttenuationSensor(HydrometerAnalyticsSensor):
+    """Apparent attenuation."""
+    _significant_change = DOWNSAMPLE_PERCENT_CHANGE
+
+    def __init__(self, coordinator, device_id: str):
+        super().__init__(coordinator, device_id, "Apparent Attenuation", "attenuation", unit="%")
+        self._attr_state_class = SensorStateClass.MEASUREMENT
+
+    @property
+    def native_value(self):
+        fermentation = self._fermentation()
+        if fermentation is None or fermentation.attenuation is None:
+            return None
+        return round(fermentation.attenuation, 1)
+
+
+class HydrometerStableGravityETASensor(HydrometerAnalyticsSensor):
+    """When the gravity is expected to be stable, or became stable."""
+
+    def __init__(self, coordinator, device_id: str):
+        super().__init__(coordinator, device_id, "Stable Gravity ETA", "stable_gravity_eta")
+        self._attr_device_class = SensorDeviceClass.TIMESTAMP
+
+    @property
+    def native_value(self):
+        fermentation = self._fermentation()
+        if fermentation is None:
+            return None
+        return as_datetime(fermentation.stable_eta)
+
+    @property
+    def extra_state_attributes(self):
+        fermentation = self._fermentation()
+        attributes = dict(super().extra_state_attributes or {})
+        if fermentation is not None:
+            attributes["stable"] = fermentation.stable_since is not None
+        return attributes or None
 
 
 # ---------------------
@@ -196,6 +336,10 @@ class HydrometerConnectionStateSensor(BaseRaptSensor):
 # ---------------------
 class TemperatureControllerTemperatureSensor(BaseRaptSensor):
     """TemperatureController Temperature Sensor."""
+    _source_fields = ("temperature",)
+    _statistic_field = "temperature"
+    _significant_change = DOWNSAMPLE_TEMPERATURE_CHANGE
+
     def __init__(self, coordinator, device_id: str):
         super().__init__(
             coordinator,
@@ -214,7 +358,128 @@ class TemperatureControllerTemperatureSensor(BaseRaptSensor):
         return "°F" if unit == "F" else "°C"
     @property
     def native_value(self):
-        device = self.coordinator.data.get(self._device_id)
-        if device:
-            return device.get("temperature")
-        return None
\ No newline at end of file
+        return self._device_value("temperature")
+
+
+# ---------------------
+# Diagnostics
+# ---------------------
+class RaptMetricsSensor(SensorEntity):
+    """Base class for the per-entry performance sensors, updated from RaptMetrics after each coordinator refresh.
+
+    Disabled by default; the per-endpoint breakdown is in the diagnostics download.
+    """
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+    _attr_should_poll = False
+
+    def __init__(self, entry, metrics, name, unique_suffix):
+        self._metrics = metrics
+        self._attr_name = name
+        self._attr_unique_id = f"{entry.entry_id}_{unique_suffix}"
+        self._attr_device_info = {
+            "identifiers": {(DOMAIN, entry.entry_id)},
+            "name": f"RAPT Cloud ({entry.title})",
+            "manufacturer": "RAPT",
+            "model": "Cloud API",
+            "entry_type": DeviceEntryType.SERVICE,
+        }
+
+    async def async_added_to_hass(self):
+        self.async_on_remove(self._metrics.add_listener(self.async_write_ha_state))
+
+
+class RaptRequestsSensor(RaptMetricsSensor):
+    """Number of requests sent to the RAPT cloud."""
+
+    def __init__(self, entry, metrics):
+        super().__init__(entry, metrics, "API Requests", "api_requests")
+        self._attr_state_class = SensorStateClass.TOTAL_INCREASING
+
+    @property
+    def native_value(self):
+        return self._metrics.total_requests
+
+
+class RaptErrorsSensor(RaptMetricsSensor):
+    """Number of failed requests, HTTP errors and timeouts."""
+
+    def __init__(self, entry, metrics):
+        super().__init__(entry, metrics, "API Errors", "api_errors")
+        self._attr_state_class = SensorStateClass.TOTAL_INCREASING
+
+    @property
+    def native_value(self):
+        return self._metrics.total_errors
+
+
+class RaptLatencySensor(RaptMetricsSensor):
+    """Average request latency."""
+
+    def __init__(self, entry, metrics):
+        super().__init__(entry, metrics, "API Latency", "api_latency")
+        self._attr_device_class = SensorDeviceClass.DURATION
+        self._attr_native_unit_of_measurement = UnitOfTime.MILLISECONDS
+        self._attr_state_class = SensorStateClass.MEASUREMENT
+
+    @property
+    def native_value(self):
+        return self._metrics.average_latency_ms
+
+
+class RaptBytesReceivedSensor(RaptMetricsSensor):
+    """Response bytes received from the RAPT cloud."""
+
+    def __init__(self, entry, metrics):
+        super().__init__(entry, metrics, "API Bytes Received", "api_bytes_received")
+        self._attr_device_class = SensorDeviceClass.DATA_SIZE
+        self._attr_native_unit_of_measurement = UnitOfInformation.BYTES
+        self._attr_state_class = SensorStateClass.TOTAL_INCREASING
+
+    @property
+    def native_value(self):
+        return self._metrics.total_bytes
+
+
+class RaptTokenRefreshesSensor(RaptMetricsSensor):
+    """Number of access tokens fetched from the identity server."""
+
+    def __init__(self, entry, metrics):
+        super().__init__(entry, metrics, "Token Refreshes", "token_refreshes")
+        self._attr_state_class = SensorStateClass.TOTAL_INCREASING
+
+    @property
+    def native_value(self):
+        return self._metrics.token_refreshes
+
+    @property
+    def extra_state_attributes(self):
+        return {"failures": self._metrics.token_failures}
+
+
+class RaptRefreshDurationSensor(RaptMetricsSensor):
+    """Duration of the last coordinator refresh."""
+
+    def __init__(self, entry, metrics, coordinator_name):
+        super().__init__(
+            entry,
+            metrics,
+            f"{coordinator_name} Refresh Duration",
+            f"{coordinator_name.lower().replace(' ', '_')}_refresh_duration",
+        )
+        self._coordinator_name = coordinator_name
+        self._attr_device_class = SensorDeviceClass.DURATION
+        self._attr_native_unit_of_measurement = UnitOfTime.MILLISECONDS
+        self._attr_state_class = SensorStateClass.MEASUREMENT
+
+    @property
+    def native_value(self):
+        refresh = self._metrics.refreshes.get(self._coordinator_name)
+        if refresh is None or refresh.last_duration is None:
+            return None
+        return round(refresh.last_duration * 1000, 1)
+
+    @property
+    def extra_state_attributes(self):
+        refresh = self._metrics.refreshes.get(self._coordinator_name)
+        return refresh.as_dict() if refresh else None
@@ -0,0 +1,168 @@
+import logging
+from datetime import datetime, timedelta, timezone
+
+from homeassistant.components.recorder.statistics import async_add_external_statistics
+from homeassistant.core import callback
+from homeassistant.util import dt as dt_util
+from homeassistant.util import slugify
+from homeassistant.util.unit_conversion import TemperatureConverter
+
+from .api.models import normalize_gravity
+from .const import CONF_TEMPERATURE_UNIT, DEFAULT_TEMPERATURE_UNIT, DOMAIN
+
+try:
+    from homeassistant.components.recorder.models import StatisticMeanType
+except ImportError:  # Home Assistant before 2025.4
+    StatisticMeanType = None
+
+try:
+    from homeassistant.components.recorder.models import StatisticMetaData
+
+    HAS_UNIT_CLASS = "unit_class" in StatisticMetaData.__annotations__
+except ImportError:
+    HAS_UNIT_CLASS = False
+
+_LOGGER = logging.getLogger(__name__)
+
+HOUR = 3600
+
+
+def statistic_id(device_id, field):
+    """Return the external statistic id of one device field, e.g. rapt_cloud_link:<id>_gravity."""
+    return f"{DOMAIN}:{slugify(f'{device_id}_{field}')}"
+
+
+def field_unit(entry, field):
+    if field == "gravity":
+        return "SG"
+    if field == "battery" or field.endswith("_utilisation"):
+        return "%"
+    unit = entry.data.get(CONF_TEMPERATURE_UNIT, DEFAULT_TEMPERATURE_UNIT)
+    return "°F" if unit == "F" else "°C"
+
+
+def field_unit_class(field):
+    """Return the unit class of a field's statistic, None for SG and percentages."""
+    if field in ("gravity", "battery") or field.endswith("_utilisation"):
+        return None
+    return TemperatureConverter.UNIT_CLASS
+
+
+def normalize_value(field, value):
+    """Convert a raw API value to the unit the statistic is stored in."""
+    if field == "gravity":
+        return normalize_gravity(value)
+    return value
+
+
+class HourlyBuckets:
+    """Running mean/min/max of one series, per clock hour.
+
+    Holds only the hours that are still open, so a stream of samples can be
+    aggregated in constant memory. Late samples for an hour that was already
+    returned are dropped rather than overwriting its row.
+    """
+
+    __slots__ = ("_buckets", "_closed")
+
+    def __init__(self):
+        # hour start (epoch seconds) -> [count, sum, min, max]
+        self._buckets = {}
+        self._closed = None
+
+    def add(self, timestamp, value):
+        if value is None or (self._closed is not None and timestamp < self._closed):
+            return
+        hour = int(timestamp // HOUR) * HOUR
+        bucket = self._buckets.get(hour)
+        if bucket is None:
+            self._buckets[hour] = [1, value, value, value]
+            return
+        bucket[0] += 1
+        bucket[1] += value
+        if value < bucket[2]:
+            bucket[2] = value
+        if value > bucket[3]:
+            bucket[3] = value
+
+    def pop_complete(self, now):
+        """Remove and return the statistics rows of every hour that ended by now (epoch seconds)."""
+        rows = []
+        for hour in sorted(self._buckets):
+            if hour + HOUR > now:
+                break
+            count, total, low, high = self._buckets.pop(hour)
+            self._closed = hour + HOUR
+            rows.append(
+                {
+                    "start": datetime.fromtimestamp(hour, timezone.utc),
+                    "mean": total / count,
+                    "min": low,
+                    "max": high,
+                }
+            )
+        return rows
+
+
+def async_import_statistics(hass, entry, device_id, device_name, field, rows):
+    """Queue hourly rows for one device field as external statistics in the recorder."""
+    metadata = {
+        "has_sum": False,
+        "name": f"{device_name or device_id} {field.replace('_', ' ').capitalize()}",
+        "source": DOMAIN,
+        "statistic_id": statistic_id(device_id, field),
+        "unit_of_measurement": field_unit(entry, field),
+    }
+    if StatisticMeanType is not None:
+        metadata["mean_type"] = StatisticMeanType.ARITHMETIC
+    else:
+        metadata["has_mean"] = True
+    if HAS_UNIT_CLASS:
+        metadata["unit_class"] = field_unit_class(field)
+    _LOGGER.debug("Importing %s hourly statistics for %s", len(rows), metadata["statistic_id"])
+    async_add_external_statistics(hass, metadata, rows)
+
+
+class DownsampledStatistics:
+    """Aggregate live readings in memory and write them as hourly external statistics.
+
+    Used in downsampled mode, where sensors write far fewer states and these
+    statistics keep long-term graphs accurate. Each device field holds at most
+    the open hour; it is written once a reading of a later hour arrives.
+
+    The statistic ids are shared with the history backfill. Hours before since
+    (the first full hour, when the backfill runs) are left to it, and every
+    hour written here moves the device's backfill cursor past it, so the two
+    never write the same hour.
+    """
+
+    def __init__(self, hass, entry, cache=None, since=None):
+        self.hass = hass
+        self.entry = entry
+        self.cache = cache
+        self.since = since
+        # (device_id, field) -> HourlyBuckets
+        self._series = {}
+
+    @callback
+    def async_add(self, device, fields, timestamp):
+        """Add one reading of a device and write the hours it completes."""
+        now = dt_util.utcnow().timestamp()
+        written = None
+        for field in fields:
+            series = self._series.get((device.id, field))
+            if series is None:
+                series = self._series[(device.id, field)] = HourlyBuckets()
+            series.add(timestamp, normalize_value(field, getattr(device, field)))
+            rows = series.pop_complete(now)
+            if self.since is not None:
+                rows = [row for row in rows if row["start"] >= self.since]
+            if rows:
+                async_import_statistics(self.hass, self.entry, device.id, device.name, field, rows)
+                written = max(written or rows[-1]["start"], rows[-1]["start"])
+        if written is not None and self.cache is not None:
+            self.cache.async_update_backfill_cursor(device.id, written + timedelta(hours=1))
+
+    def forget(self, device_id):
+        for key in [key for key in self._series if key[0] == device_id]:
+            del self._series[key]
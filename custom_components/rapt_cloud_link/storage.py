@@ -0,0 +1,97 @@
+import logging
+
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN, CACHE_SAVE_DELAY
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+
+
+class RaptCacheStore:
+    """Warm-start cache holding the access token, last device snapshots, backfill cursors and fermentation state."""
+
+    def __init__(self, hass, entry):
+        self.hass = hass
+        self._store = Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}")
+        self._data = {
+            "token": None,
+            "token_expiry": None,
+            "snapshots": {},
+            "snapshot_times": {},
+            "backfill": {},
+            "analytics": {},
+        }
+
+    async def async_load(self):
+        """Load the cache from disk, ignoring unreadable content."""
+        try:
+            stored = await self._store.async_load()
+        except Exception as err:
+            _LOGGER.warning("Could not load RAPT cache, starting cold: %s", err)
+            stored = None
+        if isinstance(stored, dict):
+            self._data.update(stored)
+
+    def get_token(self):
+        """Return (token, expiry) if a cached token is still valid, else (None, None)."""
+        token = self._data.get("token")
+        expiry = dt_util.parse_datetime(self._data.get("token_expiry") or "")
+        if not token or expiry is None or dt_util.utcnow() >= expiry:
+            return None, None
+        return token, expiry
+
+    def get_snapshot(self, key):
+        """Return the cached device snapshot for a coordinator, or None."""
+        return self._data["snapshots"].get(key)
+
+    def get_snapshot_time(self, key):
+        """Return when the cached snapshot was last known to be current, or None."""
+        return dt_util.parse_datetime(self._data["snapshot_times"].get(key) or "")
+
+    def mark_snapshot_current(self, key):
+        """Record that a poll confirmed the cached snapshot, saved along with the next change or on unload."""
+        self._data["snapshot_times"][key] = dt_util.utcnow().isoformat()
+
+    def get_backfill_cursor(self, device_id):
+        """Return the time up to which a device's history has been imported, or None."""
+        return dt_util.parse_datetime(self._data["backfill"].get(device_id) or "")
+
+    def async_update_backfill_cursor(self, device_id, when):
+        """Move a device's cursor forward to when, never back."""
+        current = self.get_backfill_cursor(device_id)
+        if current is not None and current >= when:
+            return
+        self._data["backfill"][device_id] = when.isoformat()
+        self._async_schedule_save()
+
+    def get_analytics(self, device_id):
+        """Return (original gravity, fermentation start epoch, last gravity) saved for a Pill, or None."""
+        stored = self._data["analytics"].get(device_id)
+        return tuple(stored) if stored else None
+
+    def async_update_analytics(self, device_id, original_gravity, started, gravity):
+        self._data["analytics"][device_id] = [original_gravity, started, gravity]
+        self._async_schedule_save()
+
+    def async_update_token(self, token, expiry):
+        self._data["token"] = token
+        self._data["token_expiry"] = expiry.isoformat() if expiry else None
+        self._async_schedule_save()
+
+    def async_update_snapshot(self, key, data):
+        self._data["snapshots"][key] = data
+        self._data["snapshot_times"][key] = dt_util.utcnow().isoformat()
+        self._async_schedule_save()
+
+    def _async_schedule_save(self):
+        self._store.async_delay_save(lambda: self._data, CACHE_SAVE_DELAY)
+
+    async def async_flush(self):
+        """Write the cache now instead of after the save delay, e.g. before a reload reads it."""
+        await self._store.async_save(self._data)
+
+    async def async_remove(self):
+        await self._store.async_remove()
@@ -11,16 +11,17 @@ async def async_setup_entry(hass, entry, async_add_entities):
 
     switches = []
 
-    for device_id, device in brewzilla_coordinator.data.items():
-        name = device.get("name", f"BrewZilla {device_id}")
+    for device_id in brewzilla_coordinator.data:
         switches.append(BrewZillaHeaterSwitch(brewzilla_coordinator, device_id))
         switches.append(BrewZillaPumpSwitch(brewzilla_coordinator, device_id))
 
     if switches:
-        async_add_entities(switches, update_before_add=True)
+        async_add_entities(switches, update_before_add=False)
 
 
 class BrewZillaHeaterSwitch(BaseRaptSwitch):
+    _source_fields = ("heating_enabled",)
+
     def __init__(self, coordinator, device_id: str):
         super().__init__(
             coordinator,
@@ -32,29 +33,22 @@ class BrewZillaHeaterSwitch(BaseRaptSwitch):
 
     @property
     def is_on(self):
-        device = self.coordinator.data.get(self._device_id)
-        if device:
-            return device.get("heatingEnabled", False)
-        return False
+        return self._device_value("heating_enabled", False)
 
     async def async_turn_on(self, **kwargs):
-        success = await self.coordinator.api.set_heating_enabled(self._device_id, True)
+        success = await self.coordinator.commands.async_send(self._device_id, "set_heating_enabled", True, debounce=0)
         if success:
-            device = self.coordinator.data.get(self._device_id)
-            if device:
-                device["heatingEnabled"] = True
-            self.async_write_ha_state()
+            self._async_apply_optimistic("heating_enabled", True)
 
     async def async_turn_off(self, **kwargs):
-        success = await self.coordinator.api.set_heating_enabled(self._device_id, False)
+        success = await self.coordinator.commands.async_send(self._device_id, "set_heating_enabled", False, debounce=0)
         if success:
-            device = self.coordinator.data.get(self._device_id)
-            if device:
-                device["heatingEnabled"] = False
-            self.async_write_ha_state()
+            self._async_apply_optimistic("heating_enabled", False)
 
 
 class BrewZillaPumpSwitch(BaseRaptSwitch):
+    _source_fields = ("pump_enabled",)
+
     def __init__(self, coordinator, device_id: str):
         super().__init__(
             coordinator,
@@ -66,23 +60,14 @@ class BrewZillaPumpSwitch(BaseRaptSwitch):
 
     @property
     def is_on(self):
-        device = self.coordinator.data.get(self._device_id)
-        if device:
-            return device.get("pumpEnabled", False)
-        return False
+        return self._device_value("pump_enabled", False)
 
     async def async_turn_on(self, **kwargs):
-        success = await self.coordinator.api.set_pump_enabled(self._device_id, True)
+        success = await self.coordinator.commands.async_send(self._device_id, "set_pump_enabled", True, debounce=0)
         if success:
-            device = self.coordinator.data.get(self._device_id)
-            if device:
-                device["pumpEnabled"] = True
-            self.async_write_ha_state()
+            self._async_apply_optimistic("pump_enabled", True)
 
     async def async_turn_off(self, **kwargs):
-        success = await self.coordinator.api.set_pump_enabled(self._device_id, False)
+        success = await self.coordinator.commands.async_send(self._device_id, "set_pump_enabled", False, debounce=0)
         if success:
-            device = self.coordinator.data.get(self._device_id)
-            if device:
-                device["pumpEnabled"] = False
-            self.async_write_ha_state()
\ No newline at end of file
+            self._async_apply_optimistic("pump_enabled", False)
\ No newline at end of file
@@ -0,0 +1,166 @@
+import logging
+
+from aiohttp import web
+import voluptuous as vol
+
+from homeassistant.components import webhook
+from homeassistant.const import CONF_WEBHOOK_ID
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.network import NoURLAvailableError
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+# Snake case names accepted from RAPT custom webhook templates, mapped to API field names
+FIELD_ALIASES = {
+    "device_id": "id",
+    "device_type": "deviceType",
+    "device_name": "name",
+    "created_date": "lastActivityTime",
+    "target_temperature": "targetTemperature",
+    "heating_enabled": "heatingEnabled",
+    "pump_enabled": "pumpEnabled",
+    "heating_utilisation": "heatingUtilisation",
+    "pump_utilisation": "pumpUtilisation",
+}
+
+
+def _timestamp(value):
+    """Accept an ISO 8601 timestamp string that is also a valid date."""
+    value = cv.string(value)
+    try:
+        dt_util.parse_datetime(value, raise_on_error=True)
+    except ValueError as err:
+        raise vol.Invalid(f"invalid timestamp {value!r}") from err
+    return value
+
+
+COMMON_FIELDS = {
+    vol.Required("id"): cv.string,
+    vol.Optional("deviceType"): cv.string,
+    vol.Optional("name"): cv.string,
+    vol.Optional("lastActivityTime"): _timestamp,
+    vol.Optional("connectionState"): vol.In(["Connected", "Disconnected"]),
+    vol.Optional("temperature"): vol.Coerce(float),
+}
+
+PAYLOAD_SCHEMAS = {
+    "hydrometer_coordinator": vol.Schema(
+        {
+            **COMMON_FIELDS,
+            vol.Optional("gravity"): vol.Coerce(float),
+            vol.Optional("battery"): vol.Coerce(float),
+        },
+        extra=vol.REMOVE_EXTRA,
+    ),
+    "brewzilla_coordinator": vol.Schema(
+        {
+            **COMMON_FIELDS,
+            vol.Optional("targetTemperature"): vol.Coerce(float),
+            vol.Optional("heatingEnabled"): cv.boolean,
+            vol.Optional("pumpEnabled"): cv.boolean,
+            vol.Optional("heatingUtilisation"): vol.Coerce(int),
+            vol.Optional("pumpUtilisation"): vol.Coerce(int),
+        },
+        extra=vol.REMOVE_EXTRA,
+    ),
+    "temperature_controller_coordinator": vol.Schema(
+        {
+            **COMMON_FIELDS,
+            vol.Optional("targetTemperature"): vol.Coerce(float),
+        },
+        extra=vol.REMOVE_EXTRA,
+    ),
+}
+
+DEVICE_TYPES = {
+    "hydrometer": "hydrometer_coordinator",
+    "pill": "hydrometer_coordinator",
+    "brewzilla": "brewzilla_coordinator",
+    "temperaturecontroller": "temperature_controller_coordinator",
+}
+
+
+async def async_setup_webhook(hass, entry):
+    """Register the push webhook for a config entry, creating its id on first setup."""
+    webhook_id = entry.data.get(CONF_WEBHOOK_ID)
+    if not webhook_id:
+        webhook_id = webhook.async_generate_id()
+        hass.config_entries.async_update_entry(entry, data={**entry.data, CONF_WEBHOOK_ID: webhook_id})
+
+    async def _async_handle(hass, webhook_id, request):
+        entry_data = hass.data.get(DOMAIN, {}).get(entry.entry_id)
+        if entry_data is None:
+            return web.Response(status=404)
+        return await async_handle_webhook(entry_data, request)
+
+    webhook.async_register(
+        hass,
+        DOMAIN,
+        f"RAPT Cloud Link ({entry.title})",
+        webhook_id,
+        _async_handle,
+        local_only=False,
+        allowed_methods=["POST"],
+    )
+    entry.async_on_unload(lambda: webhook.async_unregister(hass, webhook_id))
+
+    try:
+        # The URL works as a secret, keep it out of the default log level
+        _LOGGER.debug("RAPT push webhook for %s: %s", entry.title, webhook.async_generate_url(hass, webhook_id))
+    except NoURLAvailableError:
+        _LOGGER.debug("RAPT push webhook for %s registered with id %s", entry.title, webhook_id)
+
+
+def _normalize(payload):
+    return {FIELD_ALIASES.get(key, key): value for key, value in payload.items()}
+
+
+def _find_coordinator(entry_data, device):
+    """Return the coordinator key for a payload, by declared type or by known device id."""
+    device_type = str(device.get("deviceType", "")).replace(" ", "").replace("_", "").lower()
+    if device_type in DEVICE_TYPES:
+        return DEVICE_TYPES[device_type]
+    for key in PAYLOAD_SCHEMAS:
+        if device.get("id") in (entry_data[key].data or {}):
+            return key
+    return None
+
+
+async def async_handle_webhook(entry_data, request):
+    """Merge pushed telemetry into the matching coordinator without a full refresh."""
+    try:
+        payload = await request.json()
+    except ValueError:
+        return web.Response(status=400, text="Invalid JSON")
+
+    payloads = payload if isinstance(payload, list) else [payload]
+    # Validate every entry first, so an invalid one rejects the whole request instead of part of it
+    validated = []
+    for raw in payloads:
+        if not isinstance(raw, dict):
+            return web.Response(status=400, text="Expected a JSON object or list of objects")
+        device = _normalize(raw)
+        key = _find_coordinator(entry_data, device)
+        if key is None:
+            _LOGGER.debug("Ignoring webhook payload for unknown device %s", device.get("id"))
+            continue
+        try:
+            fields = PAYLOAD_SCHEMAS[key](device)
+        except vol.Invalid as err:
+            return web.Response(status=400, text=f"Invalid payload: {err}")
+        fields.pop("deviceType", None)
+        validated.append((key, fields))
+
+    merged = 0
+    for key, fields in validated:
+        coordinator = entry_data[key]
+        if coordinator.async_merge_push(fields.pop("id"), fields):
+            merged += 1
+        else:
+            # A device we have no entities for yet, let a poll discover it
+            await coordinator.async_request_refresh()
+
+    return web.json_response({"merged": merged})
@@ -0,0 +1,108 @@
+"""Check that a RAPT cloud (real or mock) still matches what the integration parses.
+
+Fetches a token and every device list, parses the records with the
+integration's models and reports anything they would skip or drop.
+
+    python tools/check_contract.py --mock
+    python tools/check_contract.py --email me@example.com --api-token <key>
+
+Needs Home Assistant installed, like the integration itself.
+"""
+
+import argparse
+import asyncio
+import logging
+import sys
+from pathlib import Path
+
+import aiohttp
+from aiohttp import web
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from custom_components.rapt_cloud_link.api.models import (  # noqa: E402
+    BrewZilla,
+    Hydrometer,
+    TemperatureController,
+)
+from custom_components.rapt_cloud_link.const import API_BASE_URL, TOKEN_URL  # noqa: E402
+
+ENDPOINTS = (
+    ("/BrewZillas/GetBrewZillas", BrewZilla),
+    ("/Hydrometers/GetHydrometers", Hydrometer),
+    ("/TemperatureControllers/GetTemperatureControllers", TemperatureController),
+)
+
+
+async def check(session, api_base_url, token_url, email, api_token):
+    """Return a list of contract problems, empty if everything parsed."""
+    problems = []
+    body = {"grant_type": "password", "client_id": "rapt-user", "username": email, "password": api_token}
+    async with session.post(token_url, data=body) as resp:
+        if resp.status != 200:
+            return [f"token endpoint returned {resp.status}"]
+        data = await resp.json()
+    if not isinstance(data.get("access_token"), str) or not isinstance(data.get("expires_in"), int):
+        problems.append(f"unexpected token response keys: {sorted(data)}")
+    headers = {"Authorization": f"Bearer {data.get('access_token')}"}
+
+    for path, model in ENDPOINTS:
+        async with session.get(f"{api_base_url}{path}", headers=headers) as resp:
+            if resp.status != 200:
+                problems.append(f"{path} returned {resp.status}")
+                continue
+            records = await resp.json()
+        if not isinstance(records, list):
+            problems.append(f"{path} returned {type(records).__name__}, expected a list")
+            continue
+        for raw in records:
+            try:
+                model.from_api(raw)
+            except ValueError as err:
+                problems.append(f"{path}: record {raw.get('id') if isinstance(raw, dict) else raw!r}: {err}")
+                continue
+            missing = sorted(key for key, _ in model.API_FIELDS.values() if key not in raw)
+            if missing:
+                problems.append(f"{path}: record {raw['id']} lacks {missing}")
+        print(f"{path}: {len(records)} records")
+    return problems
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--mock", action="store_true", help="start tools/mock_rapt_cloud.py in-process and check it")
+    parser.add_argument("--api-base-url", default=API_BASE_URL)
+    parser.add_argument("--token-url", default=TOKEN_URL)
+    parser.add_argument("--email", default="mock@example.com")
+    parser.add_argument("--api-token", default="mock")
+    args = parser.parse_args()
+
+    runner = None
+    if args.mock:
+        from mock_rapt_cloud import create_app
+
+        runner = web.AppRunner(create_app())
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        port = runner.addresses[0][1]
+        args.api_base_url = f"http://127.0.0.1:{port}/api"
+        args.token_url = f"http://127.0.0.1:{port}/connect/token"
+
+    try:
+        async with aiohttp.ClientSession() as session:
+            problems = await check(session, args.api_base_url, args.token_url, args.email, args.api_token)
+    finally:
+        if runner is not None:
+            await runner.cleanup()
+
+    for problem in problems:
+        print(f"FAIL {problem}")
+    print("OK" if not problems else f"{len(problems)} problem(s)")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.WARNING)
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,345 @@
+"""Local stand-in for the RAPT cloud, for offline testing and benchmarking.
+
+Serves the identity token endpoint and the BrewZilla, Hydrometer and
+TemperatureController endpoints used by the integration, with a configurable
+fleet size, latency, error rate, throttling and token lifetime.
+
+    python tools/mock_rapt_cloud.py --hydrometers 100 --latency 50 --error-rate 0.05
+
+Then add the integration with advanced mode enabled and set
+    API base URL:  http://<host>:8099/api
+    Token URL:     http://<host>:8099/connect/token
+
+create_app() can also be used in-process, e.g. from benchmarks. GET
+/mock/stats returns request counters, POST /mock/config changes the
+behaviour of a running server.
+"""
+
+import argparse
+import asyncio
+import math
+import random
+import secrets
+import time
+import zlib
+from dataclasses import asdict, dataclass, fields
+from datetime import datetime, timedelta, timezone
+
+from aiohttp import web
+
+
+@dataclass
+class MockConfig:
+    brewzillas: int = 1
+    hydrometers: int = 2
+    controllers: int = 1
+    # Added to every response, in milliseconds
+    latency: float = 0.0
+    jitter: float = 0.0
+    # Fraction of API requests answered with 500 / 429
+    error_rate: float = 0.0
+    throttle_rate: float = 0.0
+    retry_after: int = 5
+    # expires_in of issued tokens; requests with an expired token get 401
+    token_lifetime: int = 3600
+    # Only accept this API token if set
+    api_token: str | None = None
+    seed: int | None = None
+    # Spacing of GetTelemetry history samples, in minutes
+    telemetry_interval: int = 15
+
+
+def _now():
+    return datetime.now(timezone.utc).isoformat()
+
+
+class MockCloud:
+    """In-memory device fleet and request behaviour."""
+
+    def __init__(self, config):
+        self.config = config
+        self.random = random.Random(config.seed)
+        self.tokens = {}
+        self.stats = {"requests": 0, "errors": 0, "throttled": 0, "unauthorized": 0, "tokens": 0, "paths": {}}
+        self.brewzillas = {}
+        self.hydrometers = {}
+        self.controllers = {}
+        self.populate()
+
+    def populate(self):
+        """(Re)create the fleet to match the configured device counts."""
+        self.brewzillas = {
+            device["id"]: device
+            for device in (self._brewzilla(index) for index in range(self.config.brewzillas))
+        }
+        self.hydrometers = {
+            device["id"]: device
+            for device in (self._hydrometer(index) for index in range(self.config.hydrometers))
+        }
+        self.controllers = {
+            device["id"]: device
+            for device in (self._controller(index) for index in range(self.config.controllers))
+        }
+
+    def _device(self, kind, index):
+        return {
+            "id": f"mock-{kind.lower()}-{index:04d}",
+            "name": f"Mock {kind} {index + 1}",
+            "deviceType": kind,
+            "connectionState": "Connected",
+            "temperature": round(self.random.uniform(16, 22), 2),
+            "lastActivityTime": _now(),
+        }
+
+    def _brewzilla(self, index):
+        return {
+            **self._device("BrewZilla", index),
+            "targetTemperature": 65.0,
+            "heatingEnabled": False,
+            "pumpEnabled": False,
+            "heatingUtilisation": 100,
+            "pumpUtilisation": 100,
+        }
+
+    def _hydrometer(self, index):
+        return {
+            **self._device("Hydrometer", index),
+            "gravity": round(self.random.uniform(1040, 1060), 1),
+            "battery": round(self.random.uniform(60, 100), 1),
+        }
+
+    def _controller(self, index):
+        return {**self._device("TemperatureController", index), "targetTemperature": 19.0}
+
+    def tick(self, devices):
+        """Move every device's telemetry on a little, like a running fermentation."""
+        now = _now()
+        for device in devices.values():
+            device["temperature"] = round(device["temperature"] + self.random.uniform(-0.1, 0.1), 2)
+            if "gravity" in device:
+                device["gravity"] = round(max(1000.0, device["gravity"] - self.random.uniform(0, 0.2)), 1)
+            device["lastActivityTime"] = now
+
+    def issue_token(self):
+        token = secrets.token_urlsafe(24)
+        self.tokens[token] = time.monotonic() + self.config.token_lifetime
+        self.stats["tokens"] += 1
+        return token
+
+    def token_valid(self, request):
+        auth = request.headers.get("Authorization", "")
+        if not auth.startswith("Bearer "):
+            return False
+        expiry = self.tokens.get(auth[7:])
+        return expiry is not None and time.monotonic() < expiry
+
+
+@web.middleware
+async def _behaviour_middleware(request, handler):
+    """Apply latency, auth, throttling and injected errors to API requests."""
+    cloud = request.app["cloud"]
+    config = cloud.config
+    if request.path.startswith("/mock/"):
+        return await handler(request)
+
+    cloud.stats["requests"] += 1
+    cloud.stats["paths"][request.path] = cloud.stats["paths"].get(request.path, 0) + 1
+
+    delay = config.latency + (cloud.random.uniform(0, config.jitter) if config.jitter else 0)
+    if delay > 0:
+        await asyncio.sleep(delay / 1000)
+
+    if request.path.startswith("/api/"):
+        if not cloud.token_valid(request):
+            cloud.stats["unauthorized"] += 1
+            return web.Response(status=401)
+        roll = cloud.random.random()
+        if roll < config.throttle_rate:
+            cloud.stats["throttled"] += 1
+            return web.Response(status=429, headers={"Retry-After": str(config.retry_after)})
+        if roll < config.throttle_rate + config.error_rate:
+            cloud.stats["errors"] += 1
+            return web.Response(status=500, text="Injected error")
+    return await handler(request)
+
+
+async def _token(request):
+    cloud = request.app["cloud"]
+    form = await request.post()
+    if form.get("grant_type") != "password" or not form.get("username"):
+        return web.json_response({"error": "invalid_request"}, status=400)
+    if cloud.config.api_token is not None and form.get("password") != cloud.config.api_token:
+        return web.json_response({"error": "invalid_grant"}, status=400)
+    return web.json_response(
+        {
+            "access_token": cloud.issue_token(),
+            "expires_in": cloud.config.token_lifetime,
+            "token_type": "Bearer",
+        }
+    )
+
+
+def _list(attr):
+    async def handler(request):
+        cloud = request.app["cloud"]
+        devices = getattr(cloud, attr)
+        cloud.tick(devices)
+        return web.json_response(list(devices.values()))
+
+    return handler
+
+
+def _single(attr, id_param):
+    async def handler(request):
+        device = getattr(request.app["cloud"], attr).get(request.query.get(id_param))
+        if device is None:
+            return web.Response(status=404)
+        return web.json_response(device)
+
+    return handler
+
+
+def _setter(attr, id_param, value_param, field, convert):
+    async def handler(request):
+        device = getattr(request.app["cloud"], attr).get(request.query.get(id_param))
+        if device is None:
+            return web.Response(status=404)
+        try:
+            device[field] = convert(request.query[value_param])
+        except (KeyError, ValueError):
+            return web.Response(status=400)
+        device["lastActivityTime"] = _now()
+        return web.json_response(True)
+
+    return handler
+
+
+def _telemetry(attr, id_param):
+    """Synthetic history: a slow fermentation curve sampled every telemetry_interval minutes."""
+
+    async def handler(request):
+        cloud = request.app["cloud"]
+        device = getattr(cloud, attr).get(request.query.get(id_param))
+        if device is None:
+            return web.Response(status=404)
+        try:
+            start = datetime.fromisoformat(request.query["startDate"])
+            end = datetime.fromisoformat(request.query["endDate"])
+        except (KeyError, ValueError):
+            return web.Response(status=400)
+        step = timedelta(minutes=cloud.config.telemetry_interval)
+        # Align samples to the step so overlapping pages return identical points
+        epoch = datetime(2020, 1, 1, tzinfo=start.tzinfo or timezone.utc)
+        when = epoch + step * math.ceil((start - epoch) / step)
+        phase = (zlib.crc32(device["id"].encode()) % 1000) / 1000 * math.tau
+        samples = []
+        while when < end:
+            days = (when - epoch).total_seconds() / 86400
+            sample = {
+                "createdOn": when.isoformat(),
+                "temperature": round(19 + math.sin(days * math.tau + phase), 2),
+            }
+            if "gravity" in device:
+                sample["gravity"] = round(1010 + 40 * math.exp(-(days % 14) / 3), 1)
+                sample["battery"] = round(100 - (days % 60), 1)
+            if "targetTemperature" in device:
+                sample["targetTemperature"] = device["targetTemperature"]
+            samples.append(sample)
+            when += step
+        return web.json_response(samples)
+
+    return handler
+
+
+def _bool(value):
+    if value.lower() not in ("true", "false"):
+        raise ValueError(value)
+    return value.lower() == "true"
+
+
+async def _stats(request):
+    return web.json_response(request.app["cloud"].stats)
+
+
+async def _config(request):
+    """Update the running configuration, rebuilding the fleet if counts change."""
+    cloud = request.app["cloud"]
+    changes = await request.json()
+    known = {f.name for f in fields(MockConfig)}
+    unknown = set(changes) - known
+    if unknown:
+        return web.json_response({"unknown": sorted(unknown)}, status=400)
+    counts = (cloud.config.brewzillas, cloud.config.hydrometers, cloud.config.controllers)
+    for key, value in changes.items():
+        setattr(cloud.config, key, value)
+    if counts != (cloud.config.brewzillas, cloud.config.hydrometers, cloud.config.controllers):
+        cloud.populate()
+    return web.json_response(asdict(cloud.config))
+
+
+def create_app(config=None):
+    """Return the mock cloud as an aiohttp application."""
+    app = web.Application(middlewares=[_behaviour_middleware])
+    app["cloud"] = MockCloud(config or MockConfig())
+    app.router.add_post("/connect/token", _token)
+
+    app.router.add_get("/api/BrewZillas/GetBrewZillas", _list("brewzillas"))
+    app.router.add_get("/api/BrewZillas/GetBrewZilla", _single("brewzillas", "brewZillaId"))
+    for path, param, field, convert in (
+        ("SetHeatingEnabled", "state", "heatingEnabled", _bool),
+        ("SetPumpEnabled", "state", "pumpEnabled", _bool),
+        ("SetHeatingUtilisation", "utilisation", "heatingUtilisation", int),
+        ("SetPumpUtilisation", "utilisation", "pumpUtilisation", int),
+        ("SetTargetTemperature", "target", "targetTemperature", float),
+    ):
+        app.router.add_post(
+            f"/api/BrewZillas/{path}", _setter("brewzillas", "brewZillaId", param, field, convert)
+        )
+
+    app.router.add_get("/api/Hydrometers/GetHydrometers", _list("hydrometers"))
+    app.router.add_get("/api/Hydrometers/GetTelemetry", _telemetry("hydrometers", "hydrometerId"))
+
+    app.router.add_get("/api/TemperatureControllers/GetTemperatureControllers", _list("controllers"))
+    app.router.add_get(
+        "/api/TemperatureControllers/GetTemperatureController",
+        _single("controllers", "temperatureControllerId"),
+    )
+    app.router.add_get(
+        "/api/TemperatureControllers/GetTelemetry",
+        _telemetry("controllers", "temperatureControllerId"),
+    )
+    app.router.add_post(
+        "/api/TemperatureControllers/SetTargetTemperature",
+        _setter("controllers", "temperatureControllerId", "target", "targetTemperature", float),
+    )
+
+    app.router.add_get("/mock/stats", _stats)
+    app.router.add_post("/mock/config", _config)
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8099)
+    defaults = MockConfig()
+    parser.add_argument("--brewzillas", type=int, default=defaults.brewzillas)
+    parser.add_argument("--hydrometers", type=int, default=defaults.hydrometers)
+    parser.add_argument("--controllers", type=int, default=defaults.controllers)
+    parser.add_argument("--latency", type=float, default=defaults.latency, help="milliseconds")
+    parser.add_argument("--jitter", type=float, default=defaults.jitter, help="extra random milliseconds")
+    parser.add_argument("--error-rate", type=float, default=defaults.error_rate, help="fraction answered with 500")
+    parser.add_argument("--throttle-rate", type=float, default=defaults.throttle_rate, help="fraction answered with 429")
+    parser.add_argument("--retry-after", type=int, default=defaults.retry_after, help="seconds, sent with 429")
+    parser.add_argument("--token-lifetime", type=int, default=defaults.token_lifetime, help="seconds")
+    parser.add_argument("--api-token", default=None, help="only accept this API token")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--telemetry-interval", type=int, default=defaults.telemetry_interval, help="minutes")
+    args = parser.parse_args()
+
+    config = MockConfig(**{f.name: getattr(args, f.name) for f in fields(MockConfig)})
+    web.run_app(create_app(config), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()